@@ -0,0 +1,40 @@
+"""Add composite indexes for job maintenance queries
+
+Revision ID: 007_add_job_composite_indexes
+Revises: 006_add_metrics_enhancements
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "007_add_job_composite_indexes"
+down_revision = "006_add_metrics_enhancements"
+branch_labels = None
+depends_on = None
+
+TERMINAL_STATUSES = sa.text("status IN ('completed', 'failed', 'cancelled')")
+
+
+def upgrade() -> None:
+    # Partial index for archive/cleanup scans over finished jobs
+    op.create_index(
+        "ix_job_status_completed_at",
+        "job",
+        ["status", "completed_at"],
+        postgresql_where=TERMINAL_STATUSES,
+        sqlite_where=TERMINAL_STATUSES,
+    )
+
+    # Index for per-type historical performance queries
+    op.create_index(
+        "ix_job_type_status_started_at",
+        "job",
+        ["job_type", "status", "started_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_type_status_started_at", table_name="job")
+    op.drop_index("ix_job_status_completed_at", table_name="job")
@@ -0,0 +1,49 @@
+"""Add job scheduling columns and composite index for due scheduled job lookups
+
+Revision ID: 008_add_job_scheduled_index
+Revises: 007_add_job_composite_indexes
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "008_add_job_scheduled_index"
+down_revision = "007_add_job_composite_indexes"
+branch_labels = None
+depends_on = None
+
+# Job columns the model gained after 001 without a migration. paused keeps
+# its original 'true'/'false' string type; 010 converts it to a boolean.
+JOB_COLUMNS = [
+    sa.Column("priority", sa.Integer(), nullable=True, server_default="5"),
+    sa.Column("depends_on_job_id", sa.String(), nullable=True),
+    sa.Column("scheduled_for", sa.DateTime(), nullable=True),
+    sa.Column("paused", sa.String(), nullable=True, server_default="false"),
+    sa.Column("sla_seconds", sa.Integer(), nullable=True),
+    sa.Column("duration_seconds", sa.Float(), nullable=True),
+]
+
+
+def upgrade() -> None:
+    # Databases created with init_db() already have these columns
+    existing = {
+        column["name"] for column in sa.inspect(op.get_bind()).get_columns("job")
+    }
+    for column in JOB_COLUMNS:
+        if column.name not in existing:
+            op.add_column("job", column)
+
+    # Equality columns first so the scheduled_for range is a single seek
+    op.create_index(
+        "ix_job_status_paused_scheduled_for",
+        "job",
+        ["status", "paused", "scheduled_for"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_status_paused_scheduled_for", table_name="job")
+    for column in reversed(JOB_COLUMNS):
+        op.drop_column("job", column.name)
@@ -0,0 +1,34 @@
+"""Add dedicated scheduling columns to job
+
+Revision ID: 009_add_job_schedule_columns
+Revises: 008_add_job_scheduled_index
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "009_add_job_schedule_columns"
+down_revision = "008_add_job_scheduled_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Task info for scheduled/conditional jobs, previously stored as JSON in
+    # job.result. Existing rows are migrated lazily when they next run.
+    op.add_column("job", sa.Column("task_name", sa.String(), nullable=True))
+    op.add_column("job", sa.Column("task_kwargs", sa.Text(), nullable=True))
+    op.add_column("job", sa.Column("cron_expression", sa.String(), nullable=True))
+    op.add_column(
+        "job",
+        sa.Column("recurring", sa.Boolean(), nullable=True, server_default=sa.false()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("job", "recurring")
+    op.drop_column("job", "cron_expression")
+    op.drop_column("job", "task_kwargs")
+    op.drop_column("job", "task_name")
@@ -0,0 +1,60 @@
+"""Convert job.paused from 'true'/'false' strings to a boolean
+
+Revision ID: 010_convert_job_paused_to_boolean
+Revises: 009_add_job_schedule_columns
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "010_convert_job_paused_to_boolean"
+down_revision = "009_add_job_schedule_columns"
+branch_labels = None
+depends_on = None
+
+SCHEDULED_INDEX = "ix_job_status_paused_scheduled_for"
+SCHEDULED_INDEX_COLUMNS = ["status", "paused", "scheduled_for"]
+
+
+def upgrade() -> None:
+    # Databases created or upgraded by init_db() may already have a boolean
+    columns = sa.inspect(op.get_bind()).get_columns("job")
+    paused = next(column for column in columns if column["name"] == "paused")
+    if isinstance(paused["type"], sa.Boolean):
+        return
+
+    op.add_column(
+        "job",
+        sa.Column(
+            "paused_bool", sa.Boolean(), nullable=False, server_default=sa.false()
+        ),
+    )
+    op.execute(
+        "UPDATE job SET paused_bool = "
+        "CASE WHEN paused = 'true' THEN TRUE ELSE FALSE END"
+    )
+
+    op.drop_index(SCHEDULED_INDEX, table_name="job")
+    # Batch mode recreates the table on SQLite, which cannot drop/rename
+    with op.batch_alter_table("job") as batch_op:
+        batch_op.drop_column("paused")
+        batch_op.alter_column("paused_bool", new_column_name="paused")
+    op.create_index(SCHEDULED_INDEX, "job", SCHEDULED_INDEX_COLUMNS)
+
+
+def downgrade() -> None:
+    op.add_column(
+        "job",
+        sa.Column("paused_str", sa.String(), nullable=True, server_default="false"),
+    )
+    op.execute(
+        "UPDATE job SET paused_str = CASE WHEN paused THEN 'true' ELSE 'false' END"
+    )
+
+    op.drop_index(SCHEDULED_INDEX, table_name="job")
+    with op.batch_alter_table("job") as batch_op:
+        batch_op.drop_column("paused")
+        batch_op.alter_column("paused_str", new_column_name="paused")
+    op.create_index(SCHEDULED_INDEX, "job", SCHEDULED_INDEX_COLUMNS)
@@ -0,0 +1,36 @@
+"""Add unique index on fact_followers_snapshot (account_key, snapshot_date)
+
+Revision ID: 011_add_snapshot_unique_index
+Revises: 010_convert_job_paused_to_boolean
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "011_add_snapshot_unique_index"
+down_revision = "010_convert_job_paused_to_boolean"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep the newest snapshot of any duplicated account/day before enforcing
+    # uniqueness (the derived table lets MySQL read the table it deletes from)
+    op.execute(
+        "DELETE FROM fact_followers_snapshot WHERE snapshot_id NOT IN ("
+        "SELECT keep_id FROM (SELECT MAX(snapshot_id) AS keep_id "
+        "FROM fact_followers_snapshot GROUP BY account_key, snapshot_date) AS keep)"
+    )
+    op.create_index(
+        "uq_fact_snapshot_account_date",
+        "fact_followers_snapshot",
+        ["account_key", "snapshot_date"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "uq_fact_snapshot_account_date", table_name="fact_followers_snapshot"
+    )
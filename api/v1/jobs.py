@@ -9,6 +9,7 @@ from flask import request
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import func
 import os
+import uuid
 from datetime import datetime, timedelta
 from api.errors import BadRequestError, InternalServerError, NotFoundError
 from api.schemas import ScraperRunRequestSchema
@@ -171,17 +172,21 @@ class RunScraper(Resource):
 
         try:
             db_path = get_db_path()
-            # Trigger async task
-            task = scrape_all_accounts.delay(mode=mode, db_path=db_path)
-
-            # Create job record
+            # Create job record before queueing so the task can skip its lookup
             from tasks.utils import create_job_record
 
-            create_job_record(task.id, "scrape_all", db_path=db_path)
+            job_id = str(uuid.uuid4())
+            create_job_record(job_id, "scrape_all", db_path=db_path)
+
+            # Trigger async task
+            scrape_all_accounts.apply_async(
+                kwargs={"mode": mode, "db_path": db_path, "job_pre_created": True},
+                task_id=job_id,
+            )
 
             return {
                 "message": "Scraper job started",
-                "job_id": task.id,
+                "job_id": job_id,
                 "status": "pending",
             }
         except Exception as e:
@@ -237,19 +242,26 @@ class RunScraperSelected(Resource):
 
         try:
             db_path = get_db_path()
-            # Trigger async task
-            task = scrape_selected_accounts.delay(
-                account_keys=account_keys, mode=mode, db_path=db_path
-            )
-
-            # Create job record
+            # Create job record before queueing so the task can skip its lookup
             from tasks.utils import create_job_record
 
-            create_job_record(task.id, "scrape_selected", db_path=db_path)
+            job_id = str(uuid.uuid4())
+            create_job_record(job_id, "scrape_selected", db_path=db_path)
+
+            # Trigger async task
+            scrape_selected_accounts.apply_async(
+                kwargs={
+                    "account_keys": account_keys,
+                    "mode": mode,
+                    "db_path": db_path,
+                    "job_pre_created": True,
+                },
+                task_id=job_id,
+            )
 
             return {
                 "message": f"Scraper job started for {len(account_keys)} selected accounts",
-                "job_id": task.id,
+                "job_id": job_id,
                 "status": "pending",
             }
         except Exception as e:
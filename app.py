@@ -22,6 +22,7 @@ import csv
 import time
 import functools
 import os
+import uuid
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -1129,15 +1130,25 @@ def run_scraper():
         from tasks.scraper_tasks import scrape_all_accounts
         from tasks.utils import create_job_record
 
-        # Trigger async Celery task
-        task = scrape_all_accounts.delay(mode=mode, db_path=db_path)
-        job_id = task.id
-
-        # Create job record for tracking
+        # Create job record for tracking before queueing, so the task can
+        # skip its own lookup when the row is already there
+        job_id = str(uuid.uuid4())
         try:
             create_job_record(job_id, "scrape_all", db_path=db_path)
+            job_pre_created = True
         except Exception as e:
             logger.warning(f"Could not create job record: {e}")
+            job_pre_created = False
+
+        # Trigger async Celery task
+        scrape_all_accounts.apply_async(
+            kwargs={
+                "mode": mode,
+                "db_path": db_path,
+                "job_pre_created": job_pre_created,
+            },
+            task_id=job_id,
+        )
 
         return jsonify(
             {
@@ -13,12 +13,32 @@ redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 broker_url = os.getenv("CELERY_BROKER_URL", redis_url)
 result_backend = os.getenv("CELERY_RESULT_BACKEND", redis_url)
 
+# Optional queue for the network-bound per-account scrape tasks, meant for a
+# green-thread worker (e.g. "-Q net -P gevent -c 18")
+scrape_account_queue = os.getenv("SCRAPE_ACCOUNT_QUEUE") or None
+
+task_routes = {
+    "tasks.scraper_tasks.*": {"queue": "scraping"},
+    "tasks.scheduled_tasks.*": {"queue": "scheduled"},
+}
+if scrape_account_queue:
+    for task_name in (
+        "tasks.scraper_tasks.scrape_account",
+        "tasks.scraper_tasks.scrape_platform_account",
+    ):
+        task_routes[task_name] = {"queue": scrape_account_queue}
+
 # Create Celery app
 celery_app = Celery(
     "social_media_scraper",
     broker=broker_url,
     backend=result_backend,
-    include=["tasks.scraper_tasks", "tasks.scheduled_tasks", "tasks.job_alerting"],
+    include=[
+        "tasks.scraper_tasks",
+        "tasks.scheduled_tasks",
+        "tasks.job_alerting",
+        "tasks.job_optimization",
+    ],
 )
 
 # Celery configuration
@@ -30,10 +50,7 @@ celery_app.conf.update(
     timezone="UTC",
     enable_utc=True,
     # Task routing with priorities
-    task_routes={
-        "tasks.scraper_tasks.*": {"queue": "scraping"},
-        "tasks.scheduled_tasks.*": {"queue": "scheduled"},
-    },
+    task_routes=task_routes,
     # Task priorities (0-9, higher is more priority)
     task_default_priority=5,
     # Priority routing - higher priority tasks go to priority queue
@@ -58,6 +75,7 @@ celery_app.conf.update(
     broker_connection_retry_on_startup=True,
     broker_connection_retry=True,
     broker_connection_max_retries=10,
+    broker_pool_limit=10,  # Keep pooled producer connections between publishes
     # Result backend settings
     result_backend_transport_options={
         "master_name": "mymaster",
@@ -98,6 +116,12 @@ celery_app.conf.update(
                 hour=4, minute=0, day_of_month=1
             ),  # 4 AM UTC on 1st of month
         },
+        "train-job-result-dictionary": {
+            "task": "tasks.scheduled_tasks.train_job_result_dictionary",
+            "schedule": crontab(
+                hour=5, minute=0, day_of_week="sunday"
+            ),  # 5 AM UTC every Sunday
+        },
         "monitor-jobs-and-alert": {
             "task": "tasks.job_alerting.monitor_jobs_and_alert",
             "schedule": crontab(minute="*/5"),  # Every 5 minutes
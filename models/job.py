@@ -2,13 +2,38 @@
 Job tracking model for Celery tasks.
 """
 import json
-from sqlalchemy import Column, Integer, String, DateTime, Text, Float, Index
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+    text,
+)
 from scraper.schema import Base
 from datetime import datetime
 
 
 class Job(Base):
-    """Model for tracking background job status and progress."""
+    """
+    Model for tracking background job status and progress.
+
+    Composite indexes back the hot maintenance queries:
+
+    - ``ix_job_status_completed_at`` (partial, terminal statuses only):
+      ``archive_old_job_results`` and ``cleanup_old_jobs`` filtering on
+      ``status IN (...) AND completed_at < cutoff``.
+    - ``ix_job_type_status_started_at``: ``calculate_optimal_schedule_time``
+      filtering on ``job_type``, ``status`` and ``started_at``.
+    - ``ix_job_status_paused_scheduled_for``: ``get_due_scheduled_jobs``
+      filtering on ``status = 'scheduled' AND NOT paused AND
+      scheduled_for <= now`` (equality columns first, range column last).
+    - ``ix_job_status_created``: ``health_check`` and
+      ``get_resource_usage_optimization`` recent-job roll-ups.
+    """
 
     __tablename__ = "job"
 
@@ -28,7 +53,11 @@ class Job(Base):
     priority = Column(Integer, default=5)  # Job priority (0-9, higher is more priority)
     depends_on_job_id = Column(String)  # Job ID this job depends on
     scheduled_for = Column(DateTime)  # When job should run (for scheduling)
-    paused = Column(String, default="false")  # Whether job is paused
+    paused = Column(Boolean, default=False, nullable=False)  # Whether job is paused
+    task_name = Column(String)  # Celery task to start (scheduled/conditional jobs)
+    task_kwargs = Column(Text)  # JSON keyword arguments for task_name
+    cron_expression = Column(String)  # Cron schedule for recurring jobs
+    recurring = Column(Boolean, default=False)  # Reschedule after each run
     sla_seconds = Column(Integer)  # SLA in seconds
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     started_at = Column(DateTime)
@@ -41,6 +70,17 @@ class Job(Base):
         Index("ix_job_type_status", "job_type", "status"),
         Index("ix_job_priority_status", "priority", "status"),
         Index("ix_job_scheduled_for", "scheduled_for"),
+        Index(
+            "ix_job_status_completed_at",
+            "status",
+            "completed_at",
+            postgresql_where=text("status IN ('completed', 'failed', 'cancelled')"),
+            sqlite_where=text("status IN ('completed', 'failed', 'cancelled')"),
+        ),
+        Index("ix_job_type_status_started_at", "job_type", "status", "started_at"),
+        Index(
+            "ix_job_status_paused_scheduled_for", "status", "paused", "scheduled_for"
+        ),
     )
 
     def __repr__(self):
@@ -70,7 +110,10 @@ class Job(Base):
             "scheduled_for": self.scheduled_for.isoformat()
             if self.scheduled_for
             else None,
-            "paused": self.paused == "true",
+            "paused": bool(self.paused),
+            "task_name": self.task_name,
+            "cron_expression": self.cron_expression,
+            "recurring": bool(self.recurring),
             "sla_seconds": self.sla_seconds,
             "duration_seconds": self.duration_seconds,
             "created_at": self.created_at.isoformat() if self.created_at else None,
@@ -3,6 +3,7 @@ import logging
 import sys
 import os
 from datetime import date, timedelta
+from sqlalchemy import insert, select
 from sqlalchemy.orm import sessionmaker
 from scraper.schema import DimAccount, FactFollowersSnapshot, init_db
 
@@ -21,12 +22,30 @@ except:
     logger = logging.getLogger(__name__)
 
 
-def backfill_history(db_path="social_media.db", days_back=365):
+def backfill_history(
+    db_path="social_media.db", days_back=365, batch_size=100, account_keys=None
+):
+    """
+    Generate simulated daily snapshots for every account.
+
+    Days that already have a snapshot are skipped. New rows are inserted and
+    committed batch_size at a time.
+
+    Args:
+        db_path: Path to database file
+        days_back: Number of days of history to generate
+        batch_size: Snapshot rows per INSERT/commit
+        account_keys: Optional list of account keys to backfill. If None,
+            backfills all accounts.
+    """
     engine = init_db(db_path)
     Session = sessionmaker(bind=engine)
     session = Session()
 
-    accounts = session.query(DimAccount).all()
+    query = session.query(DimAccount)
+    if account_keys:
+        query = query.filter(DimAccount.account_key.in_(account_keys))
+    accounts = query.all()
     today = date.today()
 
     logger.info(
@@ -39,8 +58,21 @@ def backfill_history(db_path="social_media.db", days_back=365):
     )
 
     total_records = 0
+    batch = []
+    start_date = today - timedelta(days=days_back)
 
     for account in accounts:
+        # Dates already stored for this account, loaded once
+        existing_dates = set(
+            session.execute(
+                select(FactFollowersSnapshot.snapshot_date).where(
+                    FactFollowersSnapshot.account_key == account.account_key,
+                    FactFollowersSnapshot.snapshot_date >= start_date,
+                    FactFollowersSnapshot.snapshot_date < today,
+                )
+            ).scalars()
+        )
+
         # Base followers 1 year ago
         current_followers = 10000
         if account.org_name == "HHS":
@@ -55,14 +87,7 @@ def backfill_history(db_path="social_media.db", days_back=365):
         for i in range(days_back):
             target_date = today - timedelta(days=days_back - i)
 
-            # Check if exists
-            existing = (
-                session.query(FactFollowersSnapshot)
-                .filter_by(account_key=account.account_key, snapshot_date=target_date)
-                .first()
-            )
-
-            if existing:
+            if target_date in existing_dates:
                 continue
 
             # Add some noise to growth
@@ -73,7 +98,7 @@ def backfill_history(db_path="social_media.db", days_back=365):
             is_weekend = target_date.weekday() >= 5
             engagement_multiplier = 0.5 if is_weekend else 1.0
 
-            snapshot = FactFollowersSnapshot(
+            snapshot = dict(
                 account_key=account.account_key,
                 snapshot_date=target_date,
                 followers_count=int(current_count),
@@ -82,15 +107,22 @@ def backfill_history(db_path="social_media.db", days_back=365):
                 likes_count=int(random.randint(50, 2000) * engagement_multiplier),
                 comments_count=int(random.randint(5, 200) * engagement_multiplier),
                 shares_count=int(random.randint(10, 500) * engagement_multiplier),
-                engagements_total=0,
             )
-            snapshot.engagements_total = (
-                snapshot.likes_count + snapshot.comments_count + snapshot.shares_count
+            snapshot["engagements_total"] = (
+                snapshot["likes_count"]
+                + snapshot["comments_count"]
+                + snapshot["shares_count"]
             )
 
-            session.add(snapshot)
+            batch.append(snapshot)
             total_records += 1
+            if len(batch) >= batch_size:
+                session.execute(insert(FactFollowersSnapshot), batch)
+                session.commit()
+                batch = []
 
+    if batch:
+        session.execute(insert(FactFollowersSnapshot), batch)
     session.commit()
     logger.info(
         "Backfill operation complete",
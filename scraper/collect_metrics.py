@@ -4,6 +4,7 @@ import sys
 import os
 from datetime import date, timedelta
 from typing import Optional, List
+from sqlalchemy import select
 from sqlalchemy.orm import sessionmaker
 from scraper.schema import DimAccount, FactFollowersSnapshot, FactSocialPost, init_db
 from scraper.scrapers import get_scraper
@@ -144,6 +145,25 @@ def simulate_metrics(
 
     today = date.today()
 
+    # Accounts with today's snapshot were finished by an earlier (possibly
+    # interrupted) run; drop them up front so a retry only scrapes the rest
+    done_keys = set(
+        session.execute(
+            select(FactFollowersSnapshot.account_key).where(
+                FactFollowersSnapshot.snapshot_date == today
+            )
+        ).scalars()
+    )
+    if done_keys:
+        remaining = [acc for acc in accounts if acc.account_key not in done_keys]
+        if len(remaining) < len(accounts):
+            logger.info(
+                f"Resuming: {len(accounts) - len(remaining)} accounts already "
+                f"have a snapshot for {today.isoformat()}",
+                extra={"already_done": len(accounts) - len(remaining)},
+            )
+        accounts = remaining
+
     scraper = get_scraper(mode, max_sleep_seconds=max_sleep_seconds)
     
     # Log configuration for visibility
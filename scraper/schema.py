@@ -2,8 +2,11 @@
 # This file contains the fixed init_db() with proper URL validation
 print(">>> [schema.py] USING NEW FIXED VERSION – 2025-01-24 <<<", flush=True)
 
+import logging
+
 from sqlalchemy import (
     create_engine,
+    event,
     Column,
     Integer,
     String,
@@ -12,11 +15,16 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Float,
+    Index,
     Text,
+    func,
 )
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import declarative_base, relationship
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 Base = declarative_base()
 
 
@@ -96,6 +104,34 @@ class FactFollowersSnapshot(Base):
 
     account = relationship("DimAccount")
 
+    @hybrid_property
+    def calculated_engagement(self):
+        """Likes + comments + shares, treating missing counts as 0."""
+        return (
+            (self.likes_count or 0)
+            + (self.comments_count or 0)
+            + (self.shares_count or 0)
+        )
+
+    @calculated_engagement.expression
+    def calculated_engagement(cls):
+        # Same sum in SQL, so consistency checks run as one query
+        return (
+            func.coalesce(cls.likes_count, 0)
+            + func.coalesce(cls.comments_count, 0)
+            + func.coalesce(cls.shares_count, 0)
+        )
+
+    __table_args__ = (
+        # One snapshot per account per day; the target of snapshot upserts
+        Index(
+            "uq_fact_snapshot_account_date",
+            "account_key",
+            "snapshot_date",
+            unique=True,
+        ),
+    )
+
 
 class FactSocialPost(Base):
     __tablename__ = "fact_social_post"
@@ -204,6 +240,26 @@ def _construct_sqlite_url(db_path: str) -> str:
             ) from e
 
 
+# Per-connection SQLite settings: WAL lets readers run alongside the single
+# writer, and NORMAL sync is safe under WAL while avoiding an fsync per commit
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply SQLITE_PRAGMAS to each new pooled SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
 def init_db(db_path=None, enable_profiling: bool = False):
     """
     Initialize database with optimized connection pooling.
@@ -280,27 +336,48 @@ def init_db(db_path=None, enable_profiling: bool = False):
 
     try:
         if is_sqlite:
-            # SQLite configuration
+            # SQLite configuration; file databases keep a small pool of open
+            # connections so each session skips the file open and PRAGMA setup
+            if parsed_url.database in (None, "", ":memory:"):
+                pool_args = {"poolclass": NullPool}
+            else:
+                pool_args = {
+                    "poolclass": QueuePool,
+                    "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+                    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+                }
             engine = create_engine(
                 url,
-                poolclass=NullPool,
                 connect_args={"check_same_thread": False, "timeout": 20},
                 echo=False,
                 future=True,
+                **pool_args,
             )
+            event.listen(engine, "connect", _set_sqlite_pragmas)
         elif is_production:
-            # Production database (PostgreSQL/MySQL) configuration
+            # Production database (PostgreSQL/MySQL) configuration; recycle
+            # connections before server-side idle timeouts can drop them
+            pool_recycle = int(os.getenv("DB_POOL_RECYCLE", "1200"))
             try:
                 from config.performance_tuning import PerformanceTuner
 
                 tuner = PerformanceTuner()
-                pool_config = tuner.optimize_database_connections()
+                pool_config = tuner.optimize_database_connections(
+                    pool_recycle=pool_recycle
+                )
                 engine = create_engine(
                     url, poolclass=QueuePool, future=True, **pool_config
                 )
             except ImportError:
-                # PerformanceTuner not available - use default config
-                engine = create_engine(url, poolclass=QueuePool, future=True)
+                # PerformanceTuner not available - use default config, still
+                # validating pooled connections on checkout
+                engine = create_engine(
+                    url,
+                    poolclass=QueuePool,
+                    future=True,
+                    pool_pre_ping=True,
+                    pool_recycle=pool_recycle,
+                )
         else:
             raise ValueError(
                 f"Unrecognized database URL format: {url}. "
@@ -356,6 +433,9 @@ def _ensure_indexes(engine, _db_path=None):
     conn = engine.raw_connection()
     cursor = conn.cursor()
 
+    # Columns first: ix_job_status_paused_scheduled_for needs a boolean paused
+    _ensure_job_columns(cursor)
+
     indexes = [
         # DimAccount indexes
         (
@@ -433,6 +513,19 @@ def _ensure_indexes(engine, _db_path=None):
         ),
         ("CREATE INDEX IF NOT EXISTS ix_job_type_status ON job(job_type, status)",),
         ("CREATE INDEX IF NOT EXISTS ix_job_created_desc ON job(created_at DESC)",),
+        (
+            "CREATE INDEX IF NOT EXISTS ix_job_status_completed_at "
+            "ON job(status, completed_at) "
+            "WHERE status IN ('completed', 'failed', 'cancelled')",
+        ),
+        (
+            "CREATE INDEX IF NOT EXISTS ix_job_type_status_started_at "
+            "ON job(job_type, status, started_at)",
+        ),
+        (
+            "CREATE INDEX IF NOT EXISTS ix_job_status_paused_scheduled_for "
+            "ON job(status, paused, scheduled_for)",
+        ),
     ]
 
     for (index_sql,) in indexes:
@@ -442,5 +535,98 @@ def _ensure_indexes(engine, _db_path=None):
             # Table might not exist yet, skip silently
             pass
 
+    _ensure_snapshot_unique_index(cursor)
+
     conn.commit()
     conn.close()
+
+
+# Job columns added after release, as (name, SQLite DDL) pairs
+_JOB_SCHEDULE_COLUMNS = (
+    ("task_name", "VARCHAR"),
+    ("task_kwargs", "TEXT"),
+    ("cron_expression", "VARCHAR"),
+    ("recurring", "BOOLEAN DEFAULT 0"),
+)
+
+
+def _ensure_job_columns(cursor):
+    """
+    Bring the job table of an older SQLite database up to the model.
+
+    create_all() never alters an existing table, so the scheduling columns
+    added after release (alembic 009) are added here. Databases created
+    while job.paused was a VARCHAR holding 'true'/'false' get it rebuilt as
+    a boolean column; the strings would never match ``Job.paused.is_(False)``.
+
+    Args:
+        cursor: DB-API cursor on the SQLite database
+    """
+    cursor.execute("PRAGMA table_info(job)")
+    columns = {row[1]: row[2].upper() for row in cursor.fetchall()}
+    if not columns:
+        return
+
+    for name, ddl in _JOB_SCHEDULE_COLUMNS:
+        if name not in columns:
+            cursor.execute(f"ALTER TABLE job ADD COLUMN {name} {ddl}")
+
+    if not columns.get("paused") or columns["paused"] == "BOOLEAN":
+        return
+
+    # SQLite cannot change a column's type, so copy into a new column; the
+    # scheduled-job index is recreated by _ensure_indexes afterwards
+    cursor.execute("DROP INDEX IF EXISTS ix_job_status_paused_scheduled_for")
+    cursor.execute(
+        "ALTER TABLE job ADD COLUMN paused_bool BOOLEAN NOT NULL DEFAULT 0"
+    )
+    cursor.execute(
+        "UPDATE job SET paused_bool = "
+        "CASE WHEN lower(paused) IN ('true', '1') THEN 1 ELSE 0 END"
+    )
+    cursor.execute("ALTER TABLE job DROP COLUMN paused")
+    cursor.execute("ALTER TABLE job RENAME COLUMN paused_bool TO paused")
+    logger.info("Converted job.paused to a boolean column")
+
+
+def _ensure_snapshot_unique_index(cursor):
+    """
+    Create the one-snapshot-per-account-per-day unique index if missing.
+
+    Older databases may hold duplicate snapshots for a day. Those are never
+    deleted here; the index is skipped with a warning and the operator is
+    pointed at alembic migration 011, which deduplicates explicitly. Until
+    then tasks.scraper_tasks._upsert_snapshot saves snapshots without
+    ON CONFLICT.
+
+    Args:
+        cursor: DB-API cursor on the SQLite database
+    """
+    import sqlite3
+
+    try:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master "
+            "WHERE type = 'index' AND name = 'uq_fact_snapshot_account_date'"
+        )
+        if cursor.fetchone():
+            return
+        cursor.execute(
+            "SELECT 1 FROM fact_followers_snapshot "
+            "GROUP BY account_key, snapshot_date HAVING COUNT(*) > 1 LIMIT 1"
+        )
+        if cursor.fetchone():
+            logger.warning(
+                "fact_followers_snapshot has duplicate account/day snapshots; "
+                "unique index uq_fact_snapshot_account_date not created and "
+                "snapshots are saved with select-then-update. Run "
+                "'alembic upgrade head' (migration 011) to deduplicate them."
+            )
+            return
+        cursor.execute(
+            "CREATE UNIQUE INDEX uq_fact_snapshot_account_date "
+            "ON fact_followers_snapshot(account_key, snapshot_date)"
+        )
+    except sqlite3.OperationalError:
+        # Table might not exist yet, skip silently
+        pass
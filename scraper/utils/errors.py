@@ -39,3 +39,9 @@ class NetworkError(ScraperError):
     """Raised when a network error occurs."""
 
     pass
+
+
+class TransientScrapeError(ScraperError):
+    """Raised when a scrape fails in a way that may succeed on retry."""
+
+    pass
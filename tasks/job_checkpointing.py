@@ -4,7 +4,7 @@ Job checkpointing and state persistence for long-running tasks.
 import json
 import logging
 from datetime import datetime
-from tasks.utils import get_db_session
+from tasks.utils import get_db_session, json_dumps
 from models.job import Job
 
 logger = logging.getLogger(__name__)
@@ -37,7 +37,7 @@ def save_job_checkpoint(job_id, checkpoint_data, checkpoint_name="default"):
         }
 
         redis_client.setex(
-            checkpoint_key, 86400 * 7, json.dumps(checkpoint)  # 7 days TTL
+            checkpoint_key, 86400 * 7, json_dumps(checkpoint)  # 7 days TTL
         )
 
         logger.debug(f"Saved checkpoint {checkpoint_name} for job {job_id}")
@@ -86,7 +86,7 @@ def save_job_checkpoint_db(job_id, checkpoint_data, checkpoint_name="default"):
         else:
             result_data = {"_checkpoints": checkpoints}
 
-        job.result = json.dumps(result_data)
+        job.result = json_dumps(result_data)
         session.commit()
 
         return True
@@ -211,7 +211,7 @@ def save_job_state(job_id, state_data):
             except (json.JSONDecodeError, TypeError):
                 pass
 
-        job.result = json.dumps(state)
+        job.result = json_dumps(state)
         session.commit()
 
         logger.debug(f"Saved state for job {job_id}")
@@ -3,7 +3,7 @@ Job dependency management for chaining jobs.
 """
 import logging
 from datetime import datetime
-from tasks.utils import get_db_session
+from tasks.utils import get_db_session, json_dumps, json_loads
 from models.job import Job
 from celery_app import celery_app
 from tasks.job_management import check_job_dependencies
@@ -38,15 +38,13 @@ def create_dependent_job(parent_job_id, job_type, task_func, **task_kwargs):
             status="pending",
             depends_on_job_id=parent_job_id,
             priority=task_kwargs.get("priority", 5),
-            paused="true",  # Pause until dependency is met
+            paused=True,  # Pause until dependency is met
         )
         session.add(job)
         session.commit()
 
         # Store the task info in result field temporarily
-        import json
-
-        job.result = json.dumps(
+        job.result = json_dumps(
             {"task_name": task_func.name, "task_kwargs": task_kwargs}
         )
         session.commit()
@@ -70,50 +68,56 @@ def check_and_start_dependent_jobs(parent_job_id):
         # Find all jobs waiting for this parent
         dependent_jobs = (
             session.query(Job)
-            .filter_by(depends_on_job_id=parent_job_id, status="pending", paused="true")
+            .filter_by(depends_on_job_id=parent_job_id, status="pending", paused=True)
             .all()
         )
 
-        for job in dependent_jobs:
-            # Check if dependencies are satisfied
-            satisfied, blocking = check_job_dependencies(job.job_id)
-
-            if satisfied:
-                # Parse task info and start the job
-                import json
-
-                try:
-                    task_info = json.loads(job.result) if job.result else {}
-                    task_name = task_info.get("task_name")
-                    task_kwargs = task_info.get("task_kwargs", {})
-
-                    if task_name:
-                        # Get the task function
-                        task_func = celery_app.tasks.get(task_name)
-                        if task_func:
-                            # Start the task
-                            result = task_func.delay(**task_kwargs)
-                            job.job_id = result.id
-                            job.paused = "false"
-                            job.status = "pending"
-                            job.result = None  # Clear temp data
-                            session.commit()
-                            logger.info(
-                                f"Started dependent job {job.id} as {result.id}"
-                            )
+        if not dependent_jobs:
+            return
+
+        # Publish every started job over one pooled broker connection
+        with celery_app.producer_pool.acquire(block=True) as producer:
+            for job in dependent_jobs:
+                # Check if dependencies are satisfied
+                satisfied, blocking = check_job_dependencies(job.job_id)
+
+                if satisfied:
+                    # Parse task info and start the job
+                    try:
+                        task_info = json_loads(job.result) if job.result else {}
+                        task_name = task_info.get("task_name")
+                        task_kwargs = task_info.get("task_kwargs", {})
+
+                        if task_name:
+                            # Get the task function
+                            task_func = celery_app.tasks.get(task_name)
+                            if task_func:
+                                # Start the task
+                                result = task_func.apply_async(
+                                    kwargs=task_kwargs, producer=producer
+                                )
+                                job.job_id = result.id
+                                job.paused = False
+                                job.status = "pending"
+                                job.result = None  # Clear temp data
+                                session.commit()
+                                logger.info(
+                                    f"Started dependent job {job.id} as {result.id}"
+                                )
+                            else:
+                                logger.error(
+                                    f"Task {task_name} not found for "
+                                    f"dependent job {job.id}"
+                                )
                         else:
-                            logger.error(
-                                f"Task {task_name} not found for dependent job {job.id}"
-                            )
-                    else:
-                        logger.warning(f"No task name in dependent job {job.id}")
-                except Exception as e:
-                    logger.error(f"Error starting dependent job {job.id}: {e}")
-                    job.status = "failed"
-                    job.error_message = f"Failed to start: {str(e)}"
-                    session.commit()
-            else:
-                logger.info(f"Dependent job {job.id} still blocked: {blocking}")
+                            logger.warning(f"No task name in dependent job {job.id}")
+                    except Exception as e:
+                        logger.error(f"Error starting dependent job {job.id}: {e}")
+                        job.status = "failed"
+                        job.error_message = f"Failed to start: {str(e)}"
+                        session.commit()
+                else:
+                    logger.info(f"Dependent job {job.id} still blocked: {blocking}")
 
     finally:
         session.close()
@@ -50,7 +50,7 @@ def get_queue_depth(queue_name="scraping"):
         try:
             return (
                 session.query(Job)
-                .filter(Job.status == "pending", Job.paused == "false")
+                .filter(Job.status == "pending", Job.paused.is_(False))
                 .count()
             )
         finally:
@@ -69,7 +69,7 @@ def get_job_backlog():
     try:
         pending = (
             session.query(Job)
-            .filter(Job.status == "pending", Job.paused == "false")
+            .filter(Job.status == "pending", Job.paused.is_(False))
             .count()
         )
 
@@ -83,7 +83,7 @@ def get_job_backlog():
                 .filter(
                     Job.status == "pending",
                     Job.priority == priority,
-                    Job.paused == "false",
+                    Job.paused.is_(False),
                 )
                 .count()
             )
@@ -303,7 +303,7 @@ def pause_job(job_id):
             return False
 
         if job.status == "pending":
-            job.paused = "true"
+            job.paused = True
             session.commit()
 
             # Revoke the Celery task if it hasn't started
@@ -334,8 +334,8 @@ def resume_job(job_id):
         if not job:
             return False
 
-        if job.paused == "true" and job.status == "pending":
-            job.paused = "false"
+        if job.paused and job.status == "pending":
+            job.paused = False
             session.commit()
 
             # Re-queue the job (would need to re-trigger the task)
@@ -2,14 +2,96 @@
 Production optimization utilities for job management.
 """
 import logging
+import re
 import time
+from random import random as _random
 from datetime import datetime, timedelta
+from sqlalchemy import case, func, select, text
 from tasks.utils import get_db_session
 from tasks.job_management import get_queue_depth, get_job_backlog
 from models.job import Job
 
 logger = logging.getLogger(__name__)
 
+# Error message patterns used by should_retry_job, compiled once so each
+# message is scanned a single time per pattern
+_TRANSIENT_ERROR_RE = re.compile(
+    r"timeout|connection|network|temporary|rate limit|50[234]|429", re.IGNORECASE
+)
+_PERMANENT_ERROR_RE = re.compile(
+    r"not found|40[134]|invalid|malformed|authentication|authorization",
+    re.IGNORECASE,
+)
+
+# Exception types raised for bad input or code bugs; a retry gets the same
+# result, so these fail immediately instead of backing off
+NON_RETRYABLE_ERRORS = frozenset(
+    {
+        "AttributeError",
+        "JSONDecodeError",
+        "KeyError",
+        "TypeError",
+        "ValidationError",
+        "ValueError",
+    }
+)
+
+# Short-lived cache of worker inspect() replies
+WORKER_SNAPSHOT_TTL = 5
+_worker_snapshot_cache = {}
+
+
+def _duration_seconds_expr(dialect_name):
+    """
+    Build a SQL expression for ``completed_at - started_at`` in seconds.
+
+    Args:
+        dialect_name: SQLAlchemy dialect name of the bound engine
+
+    Returns:
+        SQL expression yielding the job duration in seconds, or None if the
+        dialect has no known expression
+    """
+    if dialect_name == "sqlite":
+        return (
+            func.julianday(Job.completed_at) - func.julianday(Job.started_at)
+        ) * 86400
+    if dialect_name in ("mysql", "mariadb"):
+        return func.timestampdiff(text("SECOND"), Job.started_at, Job.completed_at)
+    if dialect_name == "postgresql":
+        return func.extract("epoch", Job.completed_at - Job.started_at)
+    return None
+
+
+def _optimal_hour_from_rows(rows):
+    """
+    Find the hour of day with the lowest average job duration.
+
+    Fallback for dialects where the aggregation cannot be done in SQL.
+
+    Args:
+        rows: Iterable of ``(started_at, completed_at)`` pairs
+
+    Returns:
+        int: Optimal hour (0-23), or None if there are no rows
+    """
+    import numpy as np
+
+    rows = list(rows)
+    if not rows:
+        return None
+
+    hours = np.fromiter((r[0].hour for r in rows), dtype=np.int64, count=len(rows))
+    durations = np.fromiter(
+        ((r[1] - r[0]).total_seconds() for r in rows),
+        dtype=np.float64,
+        count=len(rows),
+    )
+    totals = np.bincount(hours, weights=durations, minlength=24)
+    counts = np.bincount(hours, minlength=24)
+    averages = np.where(counts > 0, totals / np.maximum(counts, 1), np.inf)
+    return int(np.argmin(averages))
+
 
 def calculate_optimal_schedule_time(job_type, historical_data=None):
     """
@@ -24,43 +106,41 @@ def calculate_optimal_schedule_time(job_type, historical_data=None):
     """
     session = get_db_session()
     try:
-        # Get historical job performance by hour of day
-        completed_jobs = (
-            session.query(Job)
-            .filter(
-                Job.job_type == job_type,
-                Job.status == "completed",
-                Job.started_at.isnot(None),
-                Job.completed_at.isnot(None),
-                Job.created_at >= datetime.utcnow() - timedelta(days=30),
-            )
-            .all()
+        filters = (
+            Job.job_type == job_type,
+            Job.status == "completed",
+            Job.started_at.isnot(None),
+            Job.completed_at.isnot(None),
+            Job.created_at >= datetime.utcnow() - timedelta(days=30),
         )
+        duration = _duration_seconds_expr(session.get_bind().dialect.name)
+
+        if duration is not None:
+            # Get average job duration per hour of day, aggregated in the database
+            hour = func.extract("hour", Job.started_at)
+            hour_performance = session.execute(
+                select(hour.label("h"), func.avg(duration).label("avg_s"))
+                .where(*filters)
+                .group_by(hour)
+            ).all()
+            optimal_hour = (
+                # Optimal hour is one with lowest average duration
+                int(min(hour_performance, key=lambda r: r.avg_s).h)
+                if hour_performance
+                else None
+            )
+        else:
+            # No duration expression for this dialect: fetch just the two
+            # timestamp columns and aggregate them with numpy
+            optimal_hour = _optimal_hour_from_rows(
+                session.execute(
+                    select(Job.started_at, Job.completed_at).where(*filters)
+                )
+            )
 
-        if not completed_jobs:
+        if optimal_hour is None:
             # Default to 2 AM UTC if no historical data
             optimal_hour = 2
-        else:
-            # Find hour with best average performance
-            hour_performance = {}
-            for job in completed_jobs:
-                hour = job.started_at.hour
-                duration = (job.completed_at - job.started_at).total_seconds()
-
-                if hour not in hour_performance:
-                    hour_performance[hour] = {"total": 0, "count": 0, "avg_duration": 0}
-
-                hour_performance[hour]["total"] += duration
-                hour_performance[hour]["count"] += 1
-
-            # Calculate averages and find best hour
-            for hour, data in hour_performance.items():
-                data["avg_duration"] = data["total"] / data["count"]
-
-            # Optimal hour is one with lowest average duration
-            optimal_hour = min(
-                hour_performance.items(), key=lambda x: x[1]["avg_duration"]
-            )[0]
 
         # Schedule for next occurrence of optimal hour
         now = datetime.utcnow()
@@ -88,13 +168,14 @@ def intelligent_backoff(retry_count, base_delay=60, max_delay=3600, exponential_
     Returns:
         int: Delay in seconds
     """
-    import random
-
-    # Exponential backoff
-    delay = min(base_delay * (exponential_base**retry_count), max_delay)
+    # Exponential backoff (a shift for the default integer base of 2)
+    if exponential_base == 2 and isinstance(base_delay, int) and retry_count >= 0:
+        delay = min(base_delay << retry_count, max_delay)
+    else:
+        delay = min(base_delay * (exponential_base**retry_count), max_delay)
 
     # Add jitter (random 0-20% of delay)
-    jitter = random.uniform(0, delay * 0.2)
+    jitter = _random() * delay * 0.2
 
     return int(delay + jitter)
 
@@ -104,71 +185,59 @@ def should_retry_job(job, error_type=None):
     Determine if a job should be retried based on failure analysis.
 
     Args:
-        job: Job object
-        error_type: Type of error that occurred
+        job: Job object, or None if the task has no job record
+        error_type: Name of the exception type that occurred
 
     Returns:
         tuple: (should_retry: bool, reason: str)
     """
     # Don't retry if already exceeded max retries
-    if hasattr(job, "retry_count") and job.retry_count >= 3:
+    if getattr(job, "retry_count", None) is not None and job.retry_count >= 3:
         return False, "Max retries exceeded"
 
     # Don't retry if job was cancelled
-    if job.status == "cancelled":
+    if getattr(job, "status", None) == "cancelled":
         return False, "Job was cancelled"
 
+    # Don't retry errors that no amount of waiting will fix
+    if error_type in NON_RETRYABLE_ERRORS:
+        return False, f"Non-retryable error: {error_type}"
+
     # Retry transient errors
-    transient_errors = [
-        "timeout",
-        "connection",
-        "network",
-        "temporary",
-        "rate limit",
-        "503",
-        "502",
-        "504",
-        "429",
-    ]
-
-    error_msg = (job.error_message or "").lower()
-    if any(err in error_msg for err in transient_errors):
+    error_msg = getattr(job, "error_message", None) or ""
+    if _TRANSIENT_ERROR_RE.search(error_msg):
         return True, "Transient error detected"
 
     # Don't retry permanent errors
-    permanent_errors = [
-        "not found",
-        "404",
-        "401",
-        "403",
-        "invalid",
-        "malformed",
-        "authentication",
-        "authorization",
-    ]
-
-    if any(err in error_msg for err in permanent_errors):
+    if _PERMANENT_ERROR_RE.search(error_msg):
         return False, "Permanent error detected"
 
     # Default: retry if under max attempts
     return True, "Retry allowed"
 
 
-def get_worker_scaling_recommendation():
+def get_worker_scaling_recommendation(backlog=None, worker_health=None):
     """
     Get recommendation for worker scaling based on queue depth.
 
+    Args:
+        backlog: Optional result of get_job_backlog() the caller already has
+        worker_health: Optional result of get_worker_health() the caller
+            already has
+
     Returns:
         dict: Scaling recommendation
     """
-    backlog = get_job_backlog()
+    if backlog is None:
+        backlog = get_job_backlog()
     queue_depth = backlog.get("scraping_queue_depth", 0)
     pending = backlog.get("total_pending", 0)
 
     # Get current worker count
-    from tasks.job_management import get_worker_health
+    if worker_health is None:
+        from tasks.job_management import get_worker_health
 
-    worker_health = get_worker_health()
+        worker_health = get_worker_health()
     current_workers = worker_health.get("total_workers", 0)
     active_workers = worker_health.get("active_workers", 0)
 
@@ -191,6 +260,30 @@ def get_worker_scaling_recommendation():
     return recommendation
 
 
+def _get_worker_task_snapshot(celery_app):
+    """
+    Get ``(active, reserved)`` task listings for all workers.
+
+    Each listing is a broadcast that waits for every worker to reply, so the
+    pair is fetched once and reused for WORKER_SNAPSHOT_TTL seconds.
+
+    Returns:
+        tuple: (active, reserved) dicts keyed by worker name, or None if
+            workers cannot be inspected
+    """
+    cached = _worker_snapshot_cache.get("snapshot")
+    if cached and time.monotonic() - cached[0] < WORKER_SNAPSHOT_TTL:
+        return cached[1]
+
+    inspect = celery_app.control.inspect()
+    if not inspect:
+        return None
+
+    snapshot = (inspect.active(), inspect.reserved())
+    _worker_snapshot_cache["snapshot"] = (time.monotonic(), snapshot)
+    return snapshot
+
+
 def optimize_job_distribution():
     """
     Optimize job distribution across workers.
@@ -201,12 +294,11 @@ def optimize_job_distribution():
     from celery_app import celery_app
 
     try:
-        inspect = celery_app.control.inspect()
-        if not inspect:
+        snapshot = _get_worker_task_snapshot(celery_app)
+        if snapshot is None:
             return {"status": "unavailable", "message": "Cannot inspect workers"}
 
-        active = inspect.active()
-        reserved = inspect.reserved()
+        active, reserved = snapshot
 
         # Calculate load per worker
         worker_loads = {}
@@ -255,38 +347,40 @@ def get_resource_usage_optimization():
     """
     session = get_db_session()
     try:
-        # Analyze recent job performance
-        recent_jobs = (
-            session.query(Job)
-            .filter(
+        # Analyze recent job performance in a single aggregate query
+        stats = session.execute(
+            select(
+                func.count().label("total"),
+                func.sum(case((Job.duration_seconds > 3600, 1), else_=0)).label(
+                    "long_running"
+                ),
+                func.sum(case((Job.status == "failed", 1), else_=0)).label("failed"),
+            ).where(
                 Job.created_at >= datetime.utcnow() - timedelta(days=7),
                 Job.status.in_(["completed", "failed"]),
             )
-            .all()
-        )
+        ).one()
 
-        if not recent_jobs:
+        total = stats.total or 0
+        if not total:
             return {"status": "insufficient_data", "recommendations": []}
 
         recommendations = []
 
         # Check for long-running jobs
-        long_running = [
-            j for j in recent_jobs if j.duration_seconds and j.duration_seconds > 3600
-        ]
+        long_running = stats.long_running or 0
         if long_running:
             recommendations.append(
                 {
                     "type": "long_running_jobs",
                     "severity": "medium",
-                    "message": f"{len(long_running)} jobs took longer than 1 hour",
+                    "message": f"{long_running} jobs took longer than 1 hour",
                     "suggestion": "Consider breaking long jobs into smaller chunks or increasing worker resources",
                 }
             )
 
         # Check for high failure rate
-        failed = [j for j in recent_jobs if j.status == "failed"]
-        failure_rate = len(failed) / len(recent_jobs) * 100 if recent_jobs else 0
+        failure_rate = (stats.failed or 0) / total * 100
         if failure_rate > 10:
             recommendations.append(
                 {
@@ -311,7 +405,7 @@ def get_resource_usage_optimization():
 
         return {
             "status": "ok",
-            "total_jobs_analyzed": len(recent_jobs),
+            "total_jobs_analyzed": total,
             "recommendations": recommendations,
         }
     finally:
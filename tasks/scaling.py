@@ -18,7 +18,9 @@ def get_scaling_strategy():
     """
     backlog = get_job_backlog()
     worker_health = get_worker_health()
-    scaling_rec = get_worker_scaling_recommendation()
+    scaling_rec = get_worker_scaling_recommendation(
+        backlog=backlog, worker_health=worker_health
+    )
 
     return {
         "current_state": {
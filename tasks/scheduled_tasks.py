@@ -2,9 +2,14 @@
 Scheduled periodic tasks using Celery Beat.
 """
 import os
+import re
 import json
+import uuid
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from celery.signals import task_failure, task_success
+from sqlalchemy import case, delete, func, select, text
 from celery_app import celery_app
 from tasks.utils import get_db_session
 from tasks.scraper_tasks import scrape_all_accounts
@@ -13,6 +18,20 @@ from models.job import Job
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Rows deleted per transaction by cleanup_old_jobs
+CLEANUP_BATCH_SIZE = int(os.getenv("CLEANUP_BATCH_SIZE", 1000))
+
+# Held while a daily scrape_all_accounts run is in flight (value = task id)
+DAILY_SCRAPE_LOCK_KEY = "lock:daily_scrape"
+DAILY_SCRAPE_LOCK_TTL = 23 * 3600
+
+# Monthly partitions of a range-partitioned job table (PostgreSQL)
+_JOB_PARTITION_RE = re.compile(r"^job_y(\d{4})_m(\d{2})$")
+
+# Last health_check result is shared through Redis for this many seconds
+HEALTH_CACHE_KEY = "health:last"
+HEALTH_CACHE_TTL = int(os.getenv("HEALTH_CACHE_TTL", 90))
+
 
 @celery_app.task
 def daily_scrape_all():
@@ -23,13 +42,39 @@ def daily_scrape_all():
     Returns:
         dict: Result with status
     """
+    from tasks.job_optimization import _get_redis
+
     try:
         logger.info("Starting daily scrape_all scheduled task")
         db_path = os.getenv("DB_PATH", "social_media.db")
         mode = os.getenv("SCRAPER_MODE", "real")
 
+        # Skip if yesterday's run has not finished; the lock is released when
+        # that scrape_all_accounts task succeeds or fails
+        task_id = str(uuid.uuid4())
+        try:
+            acquired = _get_redis().set(
+                DAILY_SCRAPE_LOCK_KEY, task_id, nx=True, ex=DAILY_SCRAPE_LOCK_TTL
+            )
+        except Exception as e:
+            logger.warning(f"Could not take daily scrape lock, starting anyway: {e}")
+            acquired = True
+        if not acquired:
+            logger.info("Skipping daily scrape: previous run still active")
+            return {
+                "status": "skipped",
+                "reason": "previous run still active",
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+
         # Trigger the scrape_all_accounts task asynchronously
-        result = scrape_all_accounts.delay(mode=mode, db_path=db_path)
+        try:
+            result = scrape_all_accounts.apply_async(
+                kwargs={"mode": mode, "db_path": db_path}, task_id=task_id
+            )
+        except Exception:
+            _release_daily_scrape_lock(task_id)
+            raise
 
         logger.info(f"Daily scrape job started with job_id: {result.id}")
         return {
@@ -47,6 +92,31 @@ def daily_scrape_all():
         }
 
 
+def _release_daily_scrape_lock(task_id):
+    """Release the daily scrape lock if it is held by ``task_id``."""
+    from tasks.job_optimization import _get_redis
+
+    try:
+        client = _get_redis()
+        if client.get(DAILY_SCRAPE_LOCK_KEY) == task_id.encode("utf-8"):
+            client.delete(DAILY_SCRAPE_LOCK_KEY)
+    except Exception as e:
+        logger.warning(f"Could not release daily scrape lock: {e}")
+
+
+# Filtered by name: the decorated task is a proxy, so sender= would not match
+@task_success.connect
+def _on_scrape_all_success(sender=None, **kwargs):
+    if sender is not None and sender.name == scrape_all_accounts.name:
+        _release_daily_scrape_lock(sender.request.id)
+
+
+@task_failure.connect
+def _on_scrape_all_failure(sender=None, task_id=None, **kwargs):
+    if sender is not None and sender.name == scrape_all_accounts.name:
+        _release_daily_scrape_lock(task_id)
+
+
 @celery_app.task
 def archive_old_job_results():
     """
@@ -73,6 +143,32 @@ def archive_old_job_results():
         }
 
 
+@celery_app.task
+def train_job_result_dictionary():
+    """
+    Retrain the zstd dictionary used to compress cached job results.
+    Runs weekly.
+    """
+    try:
+        logger.info("Starting train_job_result_dictionary scheduled task")
+        from tasks.job_optimization import _build_dict
+
+        dict_id = _build_dict()
+
+        return {
+            "status": "completed" if dict_id is not None else "skipped",
+            "dict_id": dict_id,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+    except Exception as e:
+        logger.error(f"Error in train_job_result_dictionary task: {e}", exc_info=True)
+        return {
+            "status": "failed",
+            "error": str(e),
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+
 @celery_app.task
 def cleanup_old_jobs():
     """
@@ -86,33 +182,42 @@ def cleanup_old_jobs():
     try:
         logger.info("Starting cleanup_old_jobs scheduled task")
         session = get_db_session()
-        from models.job import Job
 
         # Calculate cutoff date (30 days ago)
         cutoff_date = datetime.utcnow() - timedelta(days=30)
 
-        # Find old jobs
-        old_jobs = (
-            session.query(Job)
-            .filter(
+        # Whole expired months go in O(1) when the table is partitioned
+        dropped_partitions = _drop_expired_job_partitions(session, cutoff_date)
+
+        # Delete old jobs in primary-key batches so each transaction stays
+        # small and row locks are released between batches
+        batch_size = CLEANUP_BATCH_SIZE
+        old_job_ids = (
+            select(Job.id)
+            .where(
                 Job.completed_at < cutoff_date,
                 Job.status.in_(["completed", "failed", "cancelled"]),
             )
-            .all()
+            .limit(batch_size)
         )
 
-        count = len(old_jobs)
-
-        # Delete old jobs
-        for job in old_jobs:
-            session.delete(job)
-
-        session.commit()
+        count = 0
+        while True:
+            deleted = session.execute(
+                delete(Job)
+                .where(Job.id.in_(old_job_ids.scalar_subquery()))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            session.commit()
+            count += deleted
+            if deleted < batch_size:
+                break
 
         logger.info(f"Cleaned up {count} old jobs")
         return {
             "status": "completed",
             "deleted_count": count,
+            "dropped_partitions": dropped_partitions,
             "cutoff_date": cutoff_date.isoformat(),
             "message": f"Deleted {count} old jobs",
             "timestamp": datetime.utcnow().isoformat(),
@@ -131,55 +236,81 @@ def cleanup_old_jobs():
             session.close()
 
 
-@celery_app.task
-def check_conditional_jobs():
+def _drop_expired_job_partitions(session, cutoff_date):
     """
-    Check conditional jobs and start them if conditions are met.
-    Runs periodically.
+    Drop monthly job partitions that lie entirely before the cutoff.
+
+    Only applies on PostgreSQL when ``job`` is range-partitioned by
+    ``completed_at`` into partitions named ``job_yYYYY_mMM``; otherwise
+    nothing is dropped and cleanup falls back to row deletes.
+
+    Args:
+        session: Database session
+        cutoff_date: Jobs completed before this are expired
+
+    Returns:
+        list: Names of the dropped partitions
     """
-    try:
-        from tasks.scheduling import get_due_scheduled_jobs
-        from tasks.job_management import check_job_dependencies
+    if session.get_bind().dialect.name != "postgresql":
+        return []
+
+    partitions = session.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = 'job'"
+        )
+    ).scalars()
+
+    dropped = []
+    for name in partitions:
+        match = _JOB_PARTITION_RE.match(name)
+        if not match:
+            continue
+        year, month = int(match.group(1)), int(match.group(2))
+        month_end = datetime(year + month // 12, month % 12 + 1, 1)
+        if month_end <= cutoff_date:
+            session.execute(text(f'ALTER TABLE job DETACH PARTITION "{name}"'))
+            session.execute(text(f'DROP TABLE "{name}"'))
+            dropped.append(name)
+    session.commit()
+
+    if dropped:
+        logger.info(f"Dropped expired job partitions: {', '.join(dropped)}")
+    return dropped
+
+
+@celery_app.task(ignore_result=True)
+def trigger_conditional_jobs(job_type):
+    """
+    Start conditional jobs waiting on ``job_type``'s condition.
 
-        session = get_db_session()
-        try:
-            conditional_jobs = (
-                session.query(Job)
-                .filter(Job.status == "conditional", Job.paused == "false")
-                .all()
-            )
+    Queued by tasks.scheduling.publish_condition when the condition is met.
+    """
+    from tasks.scheduling import dispatch_conditional_jobs
 
-            for job in conditional_jobs:
-                # Check if dependencies are met (if any)
-                if job.depends_on_job_id:
-                    satisfied, _ = check_job_dependencies(job.job_id)
-                    if not satisfied:
-                        continue
-
-                # For now, we'll implement simple conditions
-                # In production, you'd evaluate the condition_func
-                import json
-
-                task_info = json.loads(job.result) if job.result else {}
-                condition_type = task_info.get("condition_type")
-
-                # Example: condition based on queue depth
-                if condition_type == "queue_empty":
-                    from tasks.job_management import get_queue_depth
-
-                    if get_queue_depth() == 0:
-                        # Condition met, start job
-                        task_name = task_info.get("task_name")
-                        task_kwargs = task_info.get("task_kwargs", {})
-                        # Start the job...
-                        pass
-        finally:
-            session.close()
-    except Exception as e:
-        logger.error(f"Error checking conditional jobs: {e}")
+    started = dispatch_conditional_jobs(job_type)
+    logger.info(f"Started {started} conditional {job_type} jobs")
+    return started
 
 
-@celery_app.task
+@celery_app.task(ignore_result=True)
+def check_conditional_jobs():
+    """
+    Start conditional jobs whose named condition (e.g. queue_empty) holds.
+
+    Event-driven conditional jobs are started by trigger_conditional_jobs.
+    """
+    from tasks.scheduling import poll_conditional_jobs
+
+    started = poll_conditional_jobs()
+    if started:
+        logger.info(f"Started {started} polled conditional jobs")
+    return started
+
+
+@celery_app.task(ignore_result=True)
 def process_scheduled_jobs():
     """
     Process all scheduled jobs that are due.
@@ -204,78 +335,142 @@ def health_check():
     - Redis connectivity
     - Recent job success rate
 
+    Results are cached in Redis for HEALTH_CACHE_TTL seconds so ad-hoc
+    callers between scheduled runs reuse the last result instead of
+    re-running the checks.
+
     Returns:
         dict: Health status
     """
+    from tasks.job_optimization import _get_redis
+
+    try:
+        cached = _get_redis().get(HEALTH_CACHE_KEY)
+        if cached:
+            return json.loads(cached)
+    except Exception as e:
+        logger.debug(f"Could not read cached health status: {e}")
+
+    health_status = _run_health_checks()
+
+    try:
+        _get_redis().set(
+            HEALTH_CACHE_KEY, json.dumps(health_status), ex=HEALTH_CACHE_TTL
+        )
+    except Exception as e:
+        logger.debug(f"Could not cache health status: {e}")
+
+    return health_status
+
+
+# health_check statuses from best to worst
+_HEALTH_SEVERITY = ("healthy", "degraded", "unhealthy")
+
+
+def _run_health_checks():
+    """
+    Run the health_check checks and return the health status dict.
+
+    The database checks and the worker ping wait on different servers, so
+    the ping runs in a background thread while the database is queried.
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        workers_future = executor.submit(_check_workers)
+        results = [_check_database(), workers_future.result()]
+
     health_status = {
-        "status": "healthy",
+        "status": max((r[0] for r in results), key=_HEALTH_SEVERITY.index),
         "timestamp": datetime.utcnow().isoformat(),
         "checks": {},
     }
+    for _, checks in results:
+        health_status["checks"].update(checks)
+    return health_status
 
-    # Check database
-    try:
-        session = get_db_session()
-        session.execute("SELECT 1")
-        session.close()
-        health_status["checks"]["database"] = "ok"
-    except Exception as e:
-        health_status["status"] = "unhealthy"
-        health_status["checks"]["database"] = f"error: {str(e)}"
 
-    # Check Redis (via Celery)
+def _check_database():
+    """
+    Check database connectivity and the recent job success rate.
+
+    Returns:
+        tuple: (status, checks dict)
+    """
+    status = "healthy"
+    checks = {}
+
+    # Database checks share one session (and one pooled connection)
+    session = None
     try:
-        from celery_app import celery_app
-
-        inspect = celery_app.control.inspect()
-        if inspect:
-            active_workers = inspect.active()
-            if active_workers:
-                health_status["checks"]["redis"] = "ok"
-                health_status["checks"]["celery_workers"] = len(active_workers)
-            else:
-                health_status["status"] = "degraded"
-                health_status["checks"]["redis"] = "ok"
-                health_status["checks"]["celery_workers"] = 0
-                health_status["checks"]["warning"] = "No active Celery workers"
-        else:
-            health_status["status"] = "unhealthy"
-            health_status["checks"]["redis"] = "error: Cannot connect to Celery"
+        session = get_db_session()
+        # Checking out a connection is the probe: pooled engines pre-ping it
+        # and the recent-jobs query below runs on the same connection
+        session.connection()
+        checks["database"] = "ok"
     except Exception as e:
-        health_status["status"] = "unhealthy"
-        health_status["checks"]["redis"] = f"error: {str(e)}"
+        status = "unhealthy"
+        checks["database"] = f"error: {str(e)}"
 
     # Check recent job success rate (last 24 hours)
     try:
-        session = get_db_session()
-        from models.job import Job
+        if session is None:
+            raise RuntimeError("no database session")
 
         since = datetime.utcnow() - timedelta(hours=24)
-        recent_jobs = session.query(Job).filter(Job.created_at >= since).all()
-
-        if recent_jobs:
-            completed = sum(1 for j in recent_jobs if j.status == "completed")
-            failed = sum(1 for j in recent_jobs if j.status == "failed")
-            total = len(recent_jobs)
+        row = session.execute(
+            select(
+                func.count().label("total"),
+                func.sum(case((Job.status == "completed", 1), else_=0)).label(
+                    "completed"
+                ),
+                func.sum(case((Job.status == "failed", 1), else_=0)).label("failed"),
+            ).where(Job.created_at >= since)
+        ).one()
+
+        if row.total:
+            completed = row.completed or 0
+            failed = row.failed or 0
+            total = row.total
             success_rate = (completed / total) * 100 if total > 0 else 100
 
-            health_status["checks"]["recent_jobs"] = {
+            checks["recent_jobs"] = {
                 "total": total,
                 "completed": completed,
                 "failed": failed,
                 "success_rate": round(success_rate, 2),
             }
 
-            if success_rate < 50:
-                health_status["status"] = "degraded"
+            if success_rate < 50 and status == "healthy":
+                status = "degraded"
         else:
-            health_status["checks"]["recent_jobs"] = {
+            checks["recent_jobs"] = {
                 "total": 0,
                 "message": "No recent jobs",
             }
+    except Exception as e:
+        checks["recent_jobs"] = f"error: {str(e)}"
+    finally:
+        if session is not None:
+            session.close()
+
+    return status, checks
+
 
-        session.close()
+def _check_workers():
+    """
+    Check Redis (via Celery) and that at least one worker answers.
+
+    Returns:
+        tuple: (status, checks dict)
+    """
+    try:
+        # ping only asks for liveness replies, unlike inspect().active()
+        # which makes every worker serialize its task list
+        replies = celery_app.control.ping(timeout=0.5)
     except Exception as e:
-        health_status["checks"]["recent_jobs"] = f"error: {str(e)}"
+        return "unhealthy", {"redis": f"error: {str(e)}"}
 
-    return health_status
+    checks = {"redis": "ok", "celery_workers": len(replies)}
+    if not replies:
+        checks["warning"] = "No active Celery workers"
+        return "degraded", checks
+    return "healthy", checks
@@ -2,9 +2,13 @@
 Advanced scheduling utilities for jobs.
 """
 import logging
+import uuid
+import warnings
 from datetime import datetime, timedelta
+from celery import group
 from croniter import croniter
-from tasks.utils import get_db_session
+from sqlalchemy import insert, select, update
+from tasks.utils import create_job_records, get_db_session, json_dumps, json_loads
 from models.job import Job
 from celery_app import celery_app
 
@@ -35,38 +39,22 @@ def schedule_job_with_cron(
     except Exception as e:
         raise ValueError(f"Invalid cron expression: {e}")
 
-    session = get_db_session()
-    try:
-        # Create a scheduled job record
-        job = Job(
-            job_type=job_type,
-            status="scheduled",
-            priority=priority,
-            scheduled_for=next_run,
-        )
-
-        # Store task info
-        import json
-
-        job.result = json.dumps(
-            {
-                "cron_expression": cron_expression,
-                "task_name": task_func.name,
-                "task_kwargs": task_kwargs,
-                "recurring": True,
-            }
-        )
-
-        session.add(job)
-        session.commit()
-
-        logger.info(
-            f"Scheduled job {job.id} with cron {cron_expression}, next run: {next_run}"
-        )
-        return job.job_id
+    # Create a scheduled job record
+    job_pk, job_id = _insert_job(
+        job_type=job_type,
+        status="scheduled",
+        priority=priority,
+        scheduled_for=next_run,
+        task_name=task_func.name,
+        task_kwargs=json_dumps(task_kwargs),
+        cron_expression=cron_expression,
+        recurring=True,
+    )
 
-    finally:
-        session.close()
+    logger.info(
+        f"Scheduled job {job_pk} with cron {cron_expression}, next run: {next_run}"
+    )
+    return job_id
 
 
 def schedule_job_for_datetime(
@@ -85,77 +73,300 @@ def schedule_job_for_datetime(
     Returns:
         str: Scheduled job identifier
     """
-    session = get_db_session()
-    try:
-        job = Job(
-            job_type=job_type,
-            status="scheduled",
-            priority=priority,
-            scheduled_for=scheduled_datetime,
-        )
+    job_pk, job_id = _insert_job(
+        job_type=job_type,
+        status="scheduled",
+        priority=priority,
+        scheduled_for=scheduled_datetime,
+        task_name=task_func.name,
+        task_kwargs=json_dumps(task_kwargs),
+        recurring=False,
+    )
 
-        import json
+    logger.info(f"Scheduled job {job_pk} for {scheduled_datetime}")
+    return job_id
 
-        job.result = json.dumps(
-            {
-                "task_name": task_func.name,
-                "task_kwargs": task_kwargs,
-                "recurring": False,
-            }
-        )
 
-        session.add(job)
-        session.commit()
+def condition_channel(job_type):
+    """Name of the condition that starts conditional jobs of ``job_type``."""
+    return f"condition:{job_type}"
 
-        logger.info(f"Scheduled job {job.id} for {scheduled_datetime}")
-        return job.job_id
 
-    finally:
-        session.close()
+def _queue_is_empty():
+    """Condition: the scraping queue has no reserved or active tasks."""
+    from tasks.job_management import get_queue_depth
+
+    return get_queue_depth() == 0
+
+
+# Named conditions evaluated by poll_conditional_jobs. Jobs with any other
+# condition type ("event", or "custom" rows from before conditions had
+# names) wait for publish_condition().
+CONDITION_CHECKS = {"queue_empty": _queue_is_empty}
 
 
 def schedule_conditional_job(
-    condition_func, job_type, task_func, check_interval=300, **task_kwargs
+    condition_func, job_type, task_func, check_interval=None, **task_kwargs
 ):
     """
     Schedule a job that only runs when a condition is met.
 
+    The job starts when publish_condition() is called for its job type, or,
+    for a named condition from CONDITION_CHECKS, when the periodic
+    check_conditional_jobs poll finds the condition true.
+
     Args:
-        condition_func: Function that returns True when job should run
+        condition_func: Name of a condition in CONDITION_CHECKS, or None to
+            wait for publish_condition(). Callables are deprecated and
+            ignored: they cannot be stored for the worker that checks them.
         job_type: Type of job
         task_func: Celery task function
-        check_interval: How often to check condition (seconds)
+        check_interval: Deprecated and ignored; named conditions are polled
+            by the check_conditional_jobs beat task
         **task_kwargs: Task arguments
 
     Returns:
         str: Conditional job identifier
+
+    Raises:
+        ValueError: If condition_func names an unknown condition
+    """
+    if callable(condition_func):
+        warnings.warn(
+            "schedule_conditional_job() no longer evaluates condition_func; "
+            "pass a CONDITION_CHECKS name or call publish_condition(job_type)",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        condition_func = None
+    if check_interval is not None:
+        warnings.warn(
+            "schedule_conditional_job() ignores check_interval",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+    if condition_func is not None and condition_func not in CONDITION_CHECKS:
+        raise ValueError(f"Unknown condition: {condition_func}")
+
+    condition_type = condition_func or "event"
+    channel = condition_channel(job_type)
+    job_pk, job_id = _insert_job(
+        job_type=job_type,
+        status="conditional",
+        priority=5,
+        task_name=task_func.name,
+        task_kwargs=json_dumps(task_kwargs),
+        result=json_dumps({"condition_type": condition_type, "channel": channel}),
+    )
+
+    logger.info(
+        f"Created conditional job {job_pk} waiting on {channel} ({condition_type})"
+    )
+    return job_id
+
+
+def publish_condition(job_type):
     """
+    Signal that the condition for ``job_type`` is met.
+
+    Queues a one-off task that starts every conditional job waiting on it.
+
+    Args:
+        job_type: Type of job whose condition was met
+    """
+    from tasks.scheduled_tasks import trigger_conditional_jobs
+
+    trigger_conditional_jobs.delay(job_type)
+
+
+def _condition_type(result):
+    """Condition type stored in a conditional job's result field."""
+    try:
+        return (json_loads(result) or {}).get("condition_type") if result else None
+    except (TypeError, ValueError):
+        return None
+
+
+def dispatch_conditional_jobs(job_type, condition_types=None):
+    """
+    Start the conditional jobs of ``job_type`` whose dependencies are met.
+
+    Args:
+        job_type: Type of job whose condition was met
+        condition_types: Only start jobs with one of these condition types
+            (None starts all of them)
+
+    Returns:
+        int: Number of jobs started
+    """
+    from tasks.job_management import check_job_dependencies
+
     session = get_db_session()
     try:
-        job = Job(job_type=job_type, status="conditional", priority=5)
+        rows = session.execute(
+            select(
+                Job.id,
+                Job.job_id,
+                Job.depends_on_job_id,
+                Job.task_name,
+                Job.task_kwargs,
+                Job.cron_expression,
+                Job.recurring,
+                Job.result,
+            ).where(
+                Job.status == "conditional",
+                Job.job_type == job_type,
+                Job.paused.is_(False),
+            )
+        ).all()
+        ready = [
+            row
+            for row in rows
+            if (
+                condition_types is None
+                or _condition_type(row.result) in condition_types
+            )
+            and (not row.depends_on_job_id or check_job_dependencies(row.job_id)[0])
+        ]
 
-        import json
+        started = 0
+        now = datetime.utcnow()
+        for start in range(0, len(ready), SCHEDULED_COMMIT_BATCH):
+            batch = ready[start : start + SCHEDULED_COMMIT_BATCH]
+            updates = _dispatch_scheduled_batch(batch, now, {})
+            if updates:
+                session.execute(update(Job), updates)
+            session.commit()
+            started += sum(1 for values in updates if values.get("job_id"))
+        return started
+    finally:
+        session.close()
 
-        job.result = json.dumps(
-            {
-                "condition_check_interval": check_interval,
-                "task_name": task_func.name,
-                "task_kwargs": task_kwargs,
-                "condition_type": "custom",
-            }
-        )
 
-        session.add(job)
+def poll_conditional_jobs():
+    """
+    Start conditional jobs whose named condition currently holds.
+
+    Each condition in CONDITION_CHECKS that some waiting job uses is
+    evaluated once, then the matching jobs are dispatched per job type.
+    Event-driven jobs are left for publish_condition().
+
+    Returns:
+        int: Number of jobs started
+    """
+    session = get_db_session()
+    try:
+        rows = session.execute(
+            select(Job.job_type, Job.result)
+            .where(Job.status == "conditional", Job.paused.is_(False))
+            .distinct()
+        ).all()
+    finally:
+        session.close()
+
+    waiting = {}
+    for row in rows:
+        condition_type = _condition_type(row.result)
+        if condition_type in CONDITION_CHECKS:
+            waiting.setdefault(condition_type, set()).add(row.job_type)
+
+    started = 0
+    for condition_type, job_types in waiting.items():
+        try:
+            met = CONDITION_CHECKS[condition_type]()
+        except Exception as e:
+            logger.error(f"Error checking condition {condition_type}: {e}")
+            continue
+        if not met:
+            continue
+        for job_type in sorted(job_types):
+            started += dispatch_conditional_jobs(
+                job_type, condition_types={condition_type}
+            )
+    return started
+
+
+def _insert_job(**values):
+    """
+    Insert a single job row with a Core INSERT.
+
+    Skips the ORM unit of work and the refresh SELECT that reading
+    attributes after commit would cost; the compiled INSERT is reused from
+    SQLAlchemy's statement cache.
+
+    Args:
+        **values: Job column values (job_id is generated when omitted)
+
+    Returns:
+        tuple: (primary key, job_id)
+    """
+    values.setdefault("job_id", str(uuid.uuid4()))
+    session = get_db_session()
+    try:
+        result = session.execute(insert(Job).values(**values))
         session.commit()
+        return result.inserted_primary_key[0], values["job_id"]
+    finally:
+        session.close()
+
+
+def schedule_jobs_bulk(specs, batch_size=50):
+    """
+    Schedule many jobs at once with batched multi-row INSERTs.
 
-        # Schedule a periodic check task
-        from tasks.scheduled_tasks import check_conditional_jobs
+    All specs are validated before anything is written, and the whole set
+    is committed in one transaction.
 
-        # This would be called by a periodic task
+    Args:
+        specs: Iterable of dicts with ``job_type``, ``task_func`` and either
+            ``cron_expression`` (recurring) or ``scheduled_for``; optional
+            ``priority`` (default 5) and ``task_kwargs``
+        batch_size: Rows per INSERT statement
+
+    Returns:
+        list: Scheduled job identifiers, in spec order
+
+    Raises:
+        ValueError: If a spec has an invalid cron expression or no schedule
+    """
+    now = datetime.utcnow()
+    next_runs = {}
+    rows = []
+    for spec in specs:
+        cron_expression = spec.get("cron_expression")
+        if cron_expression:
+            if cron_expression not in next_runs:
+                try:
+                    cron = croniter(cron_expression, now)
+                    next_runs[cron_expression] = cron.get_next(datetime)
+                except Exception as e:
+                    raise ValueError(f"Invalid cron expression: {e}")
+            scheduled_for = next_runs[cron_expression]
+        elif spec.get("scheduled_for"):
+            scheduled_for = spec["scheduled_for"]
+        else:
+            raise ValueError("Job spec needs a cron_expression or scheduled_for")
+
+        rows.append(
+            {
+                "job_id": str(uuid.uuid4()),
+                "job_type": spec["job_type"],
+                "status": "scheduled",
+                "priority": spec.get("priority", 5),
+                "scheduled_for": scheduled_for,
+                "task_name": spec["task_func"].name,
+                "task_kwargs": json_dumps(spec.get("task_kwargs", {})),
+                "cron_expression": cron_expression,
+                "recurring": bool(cron_expression),
+            }
+        )
 
-        logger.info(f"Created conditional job {job.id}")
-        return job.job_id
+    session = get_db_session()
+    try:
+        create_job_records(rows, session=session, batch_size=batch_size)
 
+        logger.info(f"Scheduled {len(rows)} jobs in bulk")
+        return [row["job_id"] for row in rows]
     finally:
         session.close()
 
@@ -175,7 +386,7 @@ def get_due_scheduled_jobs():
             .filter(
                 Job.status == "scheduled",
                 Job.scheduled_for <= now,
-                Job.paused == "false",
+                Job.paused.is_(False),
             )
             .all()
         )
@@ -185,55 +396,140 @@ def get_due_scheduled_jobs():
         session.close()
 
 
+# Jobs dispatched and updated per transaction in process_due_scheduled_jobs
+SCHEDULED_COMMIT_BATCH = 100
+
+
 def process_due_scheduled_jobs():
     """
     Process all scheduled jobs that are due to run.
+
+    Due jobs are read as plain rows in primary-key pages of
+    SCHEDULED_COMMIT_BATCH, sent to Celery as one group per page, and
+    updated with a single bulk UPDATE committed per page.
+    """
+    session = get_db_session()
+    try:
+        now = datetime.utcnow()
+        # Next run per cron expression; every job in this tick shares ``now``
+        next_runs = {}
+        last_id = 0
+        while True:
+            rows = session.execute(
+                select(
+                    Job.id,
+                    Job.task_name,
+                    Job.task_kwargs,
+                    Job.cron_expression,
+                    Job.recurring,
+                    Job.result,
+                )
+                .where(
+                    Job.status == "scheduled",
+                    Job.scheduled_for <= now,
+                    Job.paused.is_(False),
+                    Job.id > last_id,
+                )
+                .order_by(Job.id)
+                .limit(SCHEDULED_COMMIT_BATCH)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            updates = _dispatch_scheduled_batch(rows, now, next_runs)
+            if updates:
+                session.execute(update(Job), updates)
+            session.commit()
+
+            if len(rows) < SCHEDULED_COMMIT_BATCH:
+                break
+    finally:
+        session.close()
+
+
+def _dispatch_scheduled_batch(rows, now, next_runs):
     """
-    due_jobs = get_due_scheduled_jobs()
+    Start a batch of due jobs with a single group dispatch.
 
-    for job in due_jobs:
+    Args:
+        rows: Due job rows (id, task_name, task_kwargs, cron_expression,
+            recurring, result)
+        now: Time the due jobs were selected at
+        next_runs: Cache of next run times keyed by cron expression
+
+    Returns:
+        list: Per-job update dicts keyed by primary key, for a bulk UPDATE
+    """
+    updates = []
+    prepared = []
+    for row in rows:
         try:
-            import json
-
-            task_info = json.loads(job.result) if job.result else {}
-            task_name = task_info.get("task_name")
-            task_kwargs = task_info.get("task_kwargs", {})
-            cron_expression = task_info.get("cron_expression")
-            recurring = task_info.get("recurring", False)
-
-            if task_name:
-                task_func = celery_app.tasks.get(task_name)
-                if task_func:
-                    # Start the task
-                    result = task_func.delay(**task_kwargs)
-
-                    # Update job record
-                    session = get_db_session()
-                    try:
-                        job.job_id = result.id
-                        job.status = "pending"
-                        job.result = None
-
-                        # If recurring, schedule next run
-                        if recurring and cron_expression:
-                            from croniter import croniter
-
-                            cron = croniter(cron_expression, datetime.utcnow())
-                            job.scheduled_for = cron.get_next(datetime)
-                            job.status = "scheduled"
-                        else:
-                            job.status = "pending"
-
-                        session.commit()
-                        logger.info(f"Started scheduled job {job.id} as {result.id}")
-                    finally:
-                        session.close()
+            values = {"id": row.id}
+            task_info = row._asdict()
+            if row.task_name is None and row.result:
+                # Scheduled before task info had its own columns
+                task_info = _legacy_task_info(row.result)
+                values.update(task_info, result=None)
+
+            task_name = task_info["task_name"]
+            task_func = celery_app.tasks.get(task_name) if task_name else None
+            if task_func:
+                task_kwargs = task_info["task_kwargs"]
+                task_kwargs = json_loads(task_kwargs) if task_kwargs else {}
+                prepared.append((task_info, values, task_func.s(**task_kwargs)))
+            elif len(values) > 1:
+                updates.append(values)
         except Exception as e:
-            logger.error(f"Error processing scheduled job {job.id}: {e}")
-            session = get_db_session()
-            try:
-                job.status = "failed"
-                job.error_message = str(e)
-                session.commit()
-            finally:
-                session.close()
+            updates.append(_scheduled_job_failed(row.id, e))
+
+    if not prepared:
+        return updates
+
+    # One group publishes every message over a single producer connection
+    try:
+        results = group(signature for _, _, signature in prepared).apply_async()
+    except Exception as e:
+        failed = [_scheduled_job_failed(values["id"], e) for _, values, _ in prepared]
+        return updates + failed
+
+    for (task_info, values, _), result in zip(prepared, results.results):
+        job_pk = values["id"]
+        try:
+            values["job_id"] = result.id
+
+            # If recurring, schedule next run; otherwise hand off to the worker
+            cron_expression = task_info["cron_expression"]
+            if task_info["recurring"] and cron_expression:
+                next_run = next_runs.get(cron_expression)
+                if next_run is None:
+                    next_run = croniter(cron_expression, now).get_next(datetime)
+                    next_runs[cron_expression] = next_run
+                values["scheduled_for"] = next_run
+                values["status"] = "scheduled"
+            else:
+                values["status"] = "pending"
+
+            updates.append(values)
+            logger.info(f"Started scheduled job {job_pk} as {result.id}")
+        except Exception as e:
+            updates.append(_scheduled_job_failed(job_pk, e))
+
+    return updates
+
+
+def _legacy_task_info(result):
+    """Read task info stored as JSON in job.result into column values."""
+    task_info = json_loads(result)
+    return {
+        "task_name": task_info.get("task_name"),
+        "task_kwargs": json_dumps(task_info.get("task_kwargs", {})),
+        "cron_expression": task_info.get("cron_expression"),
+        "recurring": bool(task_info.get("recurring", False)),
+    }
+
+
+def _scheduled_job_failed(job_pk, error):
+    """Build the update for a scheduled job that could not be started."""
+    logger.error(f"Error processing scheduled job {job_pk}: {error}")
+    return {"id": job_pk, "status": "failed", "error_message": str(error)}
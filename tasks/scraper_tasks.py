@@ -2,21 +2,287 @@
 Celery tasks for scraping operations.
 """
 import os
-import json
+import time
 import logging
+import weakref
+from contextlib import closing
 from datetime import datetime, date
+from celery import chord, group
+from sqlalchemy import func, insert, inspect, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from celery_app import celery_app
-from tasks.utils import get_db_session, update_job_progress, create_job_record
+from tasks.utils import (
+    get_db_session,
+    update_job_progress,
+    create_job_record,
+    get_worker_scraper,
+    json_dumps,
+)
 from scraper.schema import DimAccount, FactFollowersSnapshot
 from scraper.collect_metrics import simulate_metrics
 from scraper.backfill import backfill_history
-from scraper.scrapers import get_scraper
+from scraper.utils.errors import TransientScrapeError
+from scraper.utils.metrics_calculator import (
+    update_account_metadata,
+    calculate_snapshot_metrics,
+)
+from models.job import Job
 from tasks.production_optimization import intelligent_backoff, should_retry_job
-from tasks.job_checkpointing import save_job_checkpoint, load_job_checkpoint
+from tasks.job_optimization import cache_job_result
+from tasks.job_dependencies import check_and_start_dependent_jobs
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Minimum seconds between progress writes that don't change the percentage
+PROGRESS_EMIT_INTERVAL = 1.0
+
+# Scraped data key -> FactFollowersSnapshot count column
+_SNAPSHOT_COUNT_FIELDS = {
+    "followers_count": "followers_count",
+    "following_count": "following_count",
+    "posts_count": "posts_count",
+    "likes_count": "likes_count",
+    "comments_count": "comments_count",
+    "shares_count": "shares_count",
+    "subscribers_count": "subscribers_count",  # For YouTube
+    "views_count": "video_views",  # For YouTube
+    "videos_count": "videos_count",  # For YouTube
+}
+
+
+def _safe_int(value, default=0):
+    """Safely convert value to integer."""
+    try:
+        if value is None:
+            return default
+        return int(float(value)) if value else default
+    except (ValueError, TypeError):
+        return default
+
+
+def _snapshot_counts(data):
+    """
+    Convert scraped count fields to snapshot column values.
+
+    Args:
+        data: Scraped account data
+
+    Returns:
+        dict: Count columns, including engagements_total
+    """
+    counts = {
+        column: _safe_int(data.get(key))
+        for key, column in _SNAPSHOT_COUNT_FIELDS.items()
+    }
+    counts["engagements_total"] = (
+        counts["likes_count"] + counts["comments_count"] + counts["shares_count"]
+    )
+    return counts
+
+
+# Engine -> whether fact_followers_snapshot has the unique (account_key,
+# snapshot_date) index that the ON CONFLICT upsert needs
+_SNAPSHOT_UNIQUE_INDEX = weakref.WeakKeyDictionary()
+
+
+def _has_snapshot_unique_index(engine):
+    """
+    Check (once per engine) for the unique account/day snapshot index.
+
+    init_db skips the index on databases that still hold duplicate
+    snapshots, and ON CONFLICT fails outright without it.
+
+    Args:
+        engine: Engine the session is bound to
+
+    Returns:
+        bool: True if the unique index or constraint exists
+    """
+    found = _SNAPSHOT_UNIQUE_INDEX.get(engine)
+    if found is None:
+        table = FactFollowersSnapshot.__tablename__
+        keys = ["account_key", "snapshot_date"]
+        inspector = inspect(engine)
+        found = any(
+            index["unique"] and index["column_names"] == keys
+            for index in inspector.get_indexes(table)
+        ) or any(
+            constraint["column_names"] == keys
+            for constraint in inspector.get_unique_constraints(table)
+        )
+        if not found:
+            logger.warning(
+                f"{table} has no unique (account_key, snapshot_date) index; "
+                "saving snapshots with select-then-update. Run 'alembic "
+                "upgrade head' (migration 011) to add it."
+            )
+        _SNAPSHOT_UNIQUE_INDEX[engine] = found
+    return found
+
+
+def _upsert_snapshot(session, snapshot):
+    """
+    Insert a snapshot, or update the account's snapshot for that day.
+
+    One INSERT ... ON CONFLICT (ON DUPLICATE KEY on MySQL) statement keyed
+    on the unique (account_key, snapshot_date) index, so there is no
+    separate existence check to race with. Databases without that index
+    fall back to updating the newest existing row for the day.
+
+    Args:
+        session: Database session
+        snapshot: Transient FactFollowersSnapshot holding the values to store
+    """
+    table = FactFollowersSnapshot.__table__
+    # Only columns that were set, so an update leaves the others untouched
+    state = inspect(snapshot).dict
+    values = {c.name: state[c.name] for c in table.columns if c.name in state}
+    updates = {
+        column: value
+        for column, value in values.items()
+        if column not in ("account_key", "snapshot_date")
+    }
+
+    engine = session.get_bind()
+    if not _has_snapshot_unique_index(engine):
+        existing_id = session.scalar(
+            select(func.max(FactFollowersSnapshot.snapshot_id)).where(
+                FactFollowersSnapshot.account_key == values["account_key"],
+                FactFollowersSnapshot.snapshot_date == values["snapshot_date"],
+            )
+        )
+        if existing_id is None:
+            session.execute(insert(table).values(**values))
+        elif updates:
+            session.execute(
+                update(table)
+                .where(table.c.snapshot_id == existing_id)
+                .values(**updates)
+            )
+        return
+
+    dialect = engine.dialect.name
+    if dialect == "sqlite":
+        stmt = sqlite_insert(table).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["account_key", "snapshot_date"], set_=updates
+        )
+    elif dialect == "postgresql":
+        stmt = postgresql_insert(table).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["account_key", "snapshot_date"], set_=updates
+        )
+    else:
+        stmt = mysql_insert(table).values(**values).on_duplicate_key_update(**updates)
+    session.execute(stmt)
+
+
+def _job_progress_callback(job_id):
+    """
+    Build a simulate_metrics progress callback that updates a job row.
+
+    Progress is mapped to the 20-90% range and written only when the whole
+    percentage changes, PROGRESS_EMIT_INTERVAL seconds have passed, or the
+    last account is done, rather than once per account.
+
+    Args:
+        job_id: Celery task ID of the job
+
+    Returns:
+        callable: progress_callback(processed, total, current_account,
+            speed, elapsed)
+    """
+    last = {"progress": None, "at": 0.0}
+
+    def progress_callback(processed, total, current_account, speed, elapsed):
+        progress = 20 + int((processed / total) * 70)  # 20-90% range
+        now = time.monotonic()
+        if (
+            progress == last["progress"]
+            and now - last["at"] < PROGRESS_EMIT_INTERVAL
+            and processed < total
+        ):
+            return
+        last["progress"] = progress
+        last["at"] = now
+
+        eta_seconds = (total - processed) / speed if speed > 0 else 0
+        eta_str = (
+            f"{int(eta_seconds // 60)}m {int(eta_seconds % 60)}s"
+            if eta_seconds > 0
+            else "--"
+        )
+
+        meta = {
+            "progress": progress,
+            "message": f"Scraping {current_account}... ({processed}/{total})",
+            "processed": processed,
+            "total": total,
+            "speed": round(speed, 2),
+            "elapsed": round(elapsed, 1),
+            "eta": eta_str,
+        }
+        update_job_progress(job_id, progress, "running", meta)
+
+    return progress_callback
+
+
+def _mark_job_running(session, job_id):
+    """
+    Mark a job row created by the enqueuer as running without loading it.
+
+    Args:
+        session: Database session
+        job_id: Celery task ID of the job
+
+    Returns:
+        bool: True if the row existed and was updated
+    """
+    result = session.execute(
+        update(Job)
+        .where(Job.job_id == job_id)
+        .values(status="running", started_at=datetime.utcnow())
+    )
+    session.commit()
+    return result.rowcount > 0
+
+
+def _finish_job(job_id, result_data, db_path):
+    """Mark a job completed with its result, without loading the row."""
+    with closing(get_db_session(db_path)) as session:
+        session.execute(
+            update(Job)
+            .where(Job.job_id == job_id)
+            .values(
+                status="completed",
+                progress=100.0,
+                result=json_dumps(result_data),
+                completed_at=datetime.utcnow(),
+            )
+        )
+        session.commit()
+
+
+def _fail_job(job_id, exc, db_path):
+    """Mark a job failed without loading the row, logging instead of raising."""
+    try:
+        with closing(get_db_session(db_path)) as session:
+            session.execute(
+                update(Job)
+                .where(Job.job_id == job_id)
+                .values(
+                    status="failed",
+                    error_message=str(exc),
+                    completed_at=datetime.utcnow(),
+                )
+            )
+            session.commit()
+    except Exception as e:
+        logger.error(f"Could not mark job {job_id} failed: {e}")
+
 
 @celery_app.task(bind=True, max_retries=3, default_retry_delay=60)
 def scrape_account(self, account_key, mode="real", db_path=None):
@@ -36,6 +302,7 @@ def scrape_account(self, account_key, mode="real", db_path=None):
 
     job_id = self.request.id
     session = None
+    job = None
 
     try:
         # Validate inputs
@@ -49,8 +316,6 @@ def scrape_account(self, account_key, mode="real", db_path=None):
         session = get_db_session(db_path)
 
         # Create or update job record
-        from models.job import Job
-
         job = None
         try:
             job = session.query(Job).filter_by(job_id=job_id).first()
@@ -62,9 +327,8 @@ def scrape_account(self, account_key, mode="real", db_path=None):
                         "scrape_account",
                         account_key=account_key,
                         db_path=db_path,
+                        session=session,
                     )
-                    session = get_db_session(db_path)  # Refresh session
-                    job = session.query(Job).filter_by(job_id=job_id).first()
                 except Exception as e:
                     logger.warning(
                         f"Could not create job record: {e}, continuing without it",
@@ -104,10 +368,6 @@ def scrape_account(self, account_key, mode="real", db_path=None):
 
         # Update progress
         try:
-            self.update_state(
-                state="PROGRESS",
-                meta={"progress": 25, "message": f"Scraping {account.handle}..."},
-            )
             update_job_progress(
                 job_id, 25, "running", {"message": f"Scraping {account.handle}..."}
             )
@@ -119,9 +379,9 @@ def scrape_account(self, account_key, mode="real", db_path=None):
             f"Starting scrape for account {account.handle} (key: {account_key})"
         )
         try:
-            scraper = get_scraper(mode)
+            scraper = get_worker_scraper(mode)
             if not scraper:
-                raise ValueError(f"Could not get scraper for mode: {mode}")
+                raise TransientScrapeError(f"Could not get scraper for mode: {mode}")
         except Exception as e:
             logger.error(
                 f"Error getting scraper: {e}",
@@ -151,7 +411,7 @@ def scrape_account(self, account_key, mode="real", db_path=None):
                 error_msg,
                 extra={"account_key": account_key, "platform": account.platform},
             )
-            raise ValueError(error_msg)
+            raise TransientScrapeError(error_msg)
 
         # Validate scraped data
         if not isinstance(data, dict):
@@ -160,25 +420,11 @@ def scrape_account(self, account_key, mode="real", db_path=None):
             )
 
         # Update progress
-        self.update_state(
-            state="PROGRESS", meta={"progress": 75, "message": "Saving results..."}
-        )
         update_job_progress(job_id, 75, "running", {"message": "Saving results..."})
 
-        # Check if snapshot exists for today
         today = date.today()
-        existing = (
-            session.query(FactFollowersSnapshot)
-            .filter_by(account_key=account_key, snapshot_date=today)
-            .first()
-        )
 
         # Update account metadata from scraped data
-        from scraper.utils.metrics_calculator import (
-            update_account_metadata,
-            calculate_snapshot_metrics,
-        )
-
         try:
             update_account_metadata(account, data)
         except Exception as metadata_error:
@@ -189,94 +435,30 @@ def scrape_account(self, account_key, mode="real", db_path=None):
             # Continue even if metadata update fails
 
         # Safely convert data values to integers
-        def safe_int(value, default=0):
-            """Safely convert value to integer."""
-            try:
-                if value is None:
-                    return default
-                return int(float(value)) if value else default
-            except (ValueError, TypeError):
-                return default
-
-        if existing:
-            # Update existing snapshot
-            try:
-                existing.followers_count = safe_int(data.get("followers_count"), 0)
-                existing.following_count = safe_int(data.get("following_count"), 0)
-                existing.posts_count = safe_int(data.get("posts_count"), 0)
-                existing.likes_count = safe_int(data.get("likes_count"), 0)
-                existing.comments_count = safe_int(data.get("comments_count"), 0)
-                existing.shares_count = safe_int(data.get("shares_count"), 0)
-                existing.subscribers_count = safe_int(
-                    data.get("subscribers_count"), 0
-                )  # For YouTube
-                existing.video_views = safe_int(
-                    data.get("views_count"), 0
-                )  # For YouTube
-                existing.videos_count = safe_int(
-                    data.get("videos_count"), 0
-                )  # For YouTube
-                existing.engagements_total = (
-                    existing.likes_count
-                    + existing.comments_count
-                    + existing.shares_count
-                )
+        counts = _snapshot_counts(data)
 
-                # Recalculate metrics
-                try:
-                    calculate_snapshot_metrics(existing, session, account, data)
-                except Exception as metrics_error:
-                    logger.warning(
-                        f"Error calculating metrics: {metrics_error}",
-                        extra={"account_key": account_key},
-                    )
-            except Exception as update_error:
-                logger.error(
-                    f"Error updating existing snapshot: {update_error}",
-                    extra={"account_key": account_key},
-                )
-                raise
-        else:
-            # Create new snapshot
-            try:
-                snapshot = FactFollowersSnapshot(
-                    account_key=account_key,
-                    snapshot_date=today,
-                    followers_count=safe_int(data.get("followers_count"), 0),
-                    following_count=safe_int(data.get("following_count"), 0),
-                    posts_count=safe_int(data.get("posts_count"), 0),
-                    likes_count=safe_int(data.get("likes_count"), 0),
-                    comments_count=safe_int(data.get("comments_count"), 0),
-                    shares_count=safe_int(data.get("shares_count"), 0),
-                    subscribers_count=safe_int(
-                        data.get("subscribers_count"), 0
-                    ),  # For YouTube
-                    video_views=safe_int(data.get("views_count"), 0),  # For YouTube
-                    videos_count=safe_int(data.get("videos_count"), 0),  # For YouTube
-                    engagements_total=0,
-                )
-                snapshot.engagements_total = (
-                    snapshot.likes_count
-                    + snapshot.comments_count
-                    + snapshot.shares_count
-                )
-
-                # Calculate additional metrics
-                try:
-                    calculate_snapshot_metrics(snapshot, session, account, data)
-                except Exception as metrics_error:
-                    logger.warning(
-                        f"Error calculating metrics: {metrics_error}",
-                        extra={"account_key": account_key},
-                    )
+        try:
+            snapshot = FactFollowersSnapshot(
+                account_key=account_key, snapshot_date=today, **counts
+            )
 
-                session.add(snapshot)
-            except Exception as create_error:
-                logger.error(
-                    f"Error creating snapshot: {create_error}",
+            # Calculate additional metrics
+            try:
+                calculate_snapshot_metrics(snapshot, session, account, data)
+            except Exception as metrics_error:
+                logger.warning(
+                    f"Error calculating metrics: {metrics_error}",
                     extra={"account_key": account_key},
                 )
-                raise
+
+            # Insert today's snapshot, or update it if it already exists
+            _upsert_snapshot(session, snapshot)
+        except Exception as upsert_error:
+            logger.error(
+                f"Error saving snapshot: {upsert_error}",
+                extra={"account_key": account_key},
+            )
+            raise
 
         try:
             session.commit()
@@ -303,7 +485,7 @@ def scrape_account(self, account_key, mode="real", db_path=None):
                 job.status = "completed"
                 job.progress = 100.0
                 try:
-                    job.result = json.dumps(result_data)
+                    job.result = json_dumps(result_data)
                 except (TypeError, ValueError) as json_error:
                     logger.warning(
                         f"Error serializing result data: {json_error}",
@@ -329,16 +511,12 @@ def scrape_account(self, account_key, mode="real", db_path=None):
 
         # Cache result if enabled
         try:
-            from tasks.job_optimization import cache_job_result
-
             cache_job_result(job_id, result_data)
         except Exception as e:
             logger.debug(f"Could not cache job result: {e}")
 
         # Check and start dependent jobs
         try:
-            from tasks.job_dependencies import check_and_start_dependent_jobs
-
             check_and_start_dependent_jobs(job_id)
         except Exception as e:
             logger.warning(f"Error checking dependent jobs: {e}")
@@ -361,8 +539,6 @@ def scrape_account(self, account_key, mode="real", db_path=None):
             try:
                 session.rollback()
                 # Update job as failed
-                from models.job import Job
-
                 try:
                     job = session.query(Job).filter_by(job_id=job_id).first()
                     if job:
@@ -409,13 +585,14 @@ def scrape_account(self, account_key, mode="real", db_path=None):
 
 
 @celery_app.task(bind=True, max_retries=2, default_retry_delay=120)
-def scrape_all_accounts(self, mode="real", db_path=None):
+def scrape_all_accounts(self, mode="real", db_path=None, job_pre_created=False):
     """
     Scrape metrics for all accounts.
 
     Args:
         mode: Scraper mode ('simulated' or 'real')
         db_path: Path to database file
+        job_pre_created: True if the enqueuer already inserted the job row
 
     Returns:
         dict: Result with status and summary
@@ -428,29 +605,27 @@ def scrape_all_accounts(self, mode="real", db_path=None):
 
     try:
         # Create or update job record
-        from models.job import Job
-
-        job = session.query(Job).filter_by(job_id=job_id).first()
-        if not job:
-            job = Job(
-                job_id=job_id,
-                job_type="scrape_all",
-                status="running",
-                started_at=datetime.utcnow(),
-            )
-            session.add(job)
-        else:
-            job.status = "running"
-            job.started_at = datetime.utcnow()
-        session.commit()
+        if not (job_pre_created and _mark_job_running(session, job_id)):
+            job = session.query(Job).filter_by(job_id=job_id).first()
+            if not job:
+                job = Job(
+                    job_id=job_id,
+                    job_type="scrape_all",
+                    status="running",
+                    started_at=datetime.utcnow(),
+                )
+                session.add(job)
+            else:
+                job.status = "running"
+                job.started_at = datetime.utcnow()
+            session.commit()
 
-        # Get all active accounts
-        accounts = (
-            session.query(DimAccount)
-            .filter((DimAccount.is_active == True) | (DimAccount.is_active.is_(None)))
-            .all()
-        )
-        total_accounts = len(accounts)
+        # Count active accounts; simulate_metrics loads them itself
+        total_accounts = session.execute(
+            select(func.count())
+            .select_from(DimAccount)
+            .where(DimAccount.is_active.is_(True) | DimAccount.is_active.is_(None))
+        ).scalar_one()
 
         if total_accounts == 0:
             raise ValueError("No accounts found in database")
@@ -458,13 +633,6 @@ def scrape_all_accounts(self, mode="real", db_path=None):
         logger.info(f"Starting scrape_all_accounts job for {total_accounts} accounts")
 
         # Update progress
-        self.update_state(
-            state="PROGRESS",
-            meta={
-                "progress": 10,
-                "message": f"Starting scrape for {total_accounts} accounts...",
-            },
-        )
         update_job_progress(
             job_id,
             10,
@@ -476,36 +644,12 @@ def scrape_all_accounts(self, mode="real", db_path=None):
         session.close()  # Close before calling simulate_metrics which creates its own session
 
         # Update progress before starting
-        self.update_state(
-            state="PROGRESS", meta={"progress": 20, "message": "Running scraper..."}
-        )
         update_job_progress(job_id, 20, "running", {"message": "Running scraper..."})
 
         # Progress callback to update job progress
-        def progress_callback(processed, total, current_account, speed, elapsed):
-            progress = 20 + int((processed / total) * 70)  # 20-90% range
-            eta_seconds = (total - processed) / speed if speed > 0 else 0
-            eta_str = (
-                f"{int(eta_seconds // 60)}m {int(eta_seconds % 60)}s"
-                if eta_seconds > 0
-                else "--"
-            )
-
-            meta = {
-                "progress": progress,
-                "message": f"Scraping {current_account}... ({processed}/{total})",
-                "processed": processed,
-                "total": total,
-                "speed": round(speed, 2),
-                "elapsed": round(elapsed, 1),
-                "eta": eta_str,
-            }
-            self.update_state(state="PROGRESS", meta=meta)
-            update_job_progress(job_id, progress, "running", meta)
+        progress_callback = _job_progress_callback(job_id)
 
         # Optimize: Use more workers for better parallelization (up to 10)
-        import os
-
         max_workers = min(10, int(os.getenv("SCRAPER_MAX_WORKERS", "8")))
         simulate_metrics(
             db_path=db_path,
@@ -516,42 +660,22 @@ def scrape_all_accounts(self, mode="real", db_path=None):
         )
 
         # Update progress after completion
-        self.update_state(
-            state="PROGRESS", meta={"progress": 90, "message": "Finalizing..."}
-        )
         update_job_progress(job_id, 90, "running", {"message": "Finalizing..."})
 
-        # Reopen session for job update
-        session = get_db_session(db_path)
-        job = session.query(Job).filter_by(job_id=job_id).first()
-
         # Update job as completed
         result_data = {
             "status": "completed",
             "total_accounts": total_accounts,
             "message": f"Successfully scraped {total_accounts} accounts",
         }
-
-        job.status = "completed"
-        job.progress = 100.0
-        job.result = json.dumps(result_data)
-        job.completed_at = datetime.utcnow()
-        session.commit()
+        _finish_job(job_id, result_data, db_path)
 
         return result_data
 
     except Exception as exc:
-        if "session" in locals():
-            session.rollback()
-            from models.job import Job
-
-            job = session.query(Job).filter_by(job_id=job_id).first()
-            if job:
-                job.status = "failed"
-                job.error_message = str(exc)
-                job.completed_at = datetime.utcnow()
-                session.commit()
-            session.close()
+        session.rollback()
+        session.close()
+        _fail_job(job_id, exc, db_path)
 
         # Retry if we haven't exceeded max retries
         if self.request.retries < self.max_retries:
@@ -581,8 +705,6 @@ def scrape_platform(self, platform, mode="real", db_path=None):
 
     try:
         # Create or update job record
-        from models.job import Job
-
         job = session.query(Job).filter_by(job_id=job_id).first()
         if not job:
             job = Job(
@@ -598,26 +720,23 @@ def scrape_platform(self, platform, mode="real", db_path=None):
             job.started_at = datetime.utcnow()
         session.commit()
 
-        # Get active accounts for platform
-        accounts = (
-            session.query(DimAccount)
-            .filter_by(platform=platform)
-            .filter((DimAccount.is_active == True) | (DimAccount.is_active.is_(None)))
+        # Get active account keys for platform
+        account_keys = (
+            session.execute(
+                select(DimAccount.account_key).where(
+                    DimAccount.platform == platform,
+                    DimAccount.is_active.is_(True) | DimAccount.is_active.is_(None),
+                )
+            )
+            .scalars()
             .all()
         )
-        total_accounts = len(accounts)
+        total_accounts = len(account_keys)
 
         if total_accounts == 0:
             raise ValueError(f"No accounts found for platform {platform}")
 
         # Update progress
-        self.update_state(
-            state="PROGRESS",
-            meta={
-                "progress": 10,
-                "message": f"Starting scrape for {total_accounts} {platform} accounts...",
-            },
-        )
         update_job_progress(
             job_id,
             10,
@@ -625,85 +744,53 @@ def scrape_platform(self, platform, mode="real", db_path=None):
             {"message": f"Starting scrape for {total_accounts} {platform} accounts..."},
         )
 
-        # Scrape each account
-        scraper = get_scraper(mode)
         today = date.today()
-        processed = 0
-
-        for i, account in enumerate(accounts):
-            # Update progress
-            progress = 10 + int((i / total_accounts) * 80)
-            self.update_state(
-                state="PROGRESS",
-                meta={"progress": progress, "message": f"Scraping {account.handle}..."},
-            )
-            update_job_progress(
-                job_id,
-                progress,
-                "running",
-                {"message": f"Scraping {account.handle}..."},
-            )
-
-            # Check if snapshot exists for today
-            existing = (
-                session.query(FactFollowersSnapshot)
-                .filter_by(account_key=account.account_key, snapshot_date=today)
-                .first()
-            )
 
-            if existing:
-                processed += 1
-                continue
+        # Accounts that already have today's snapshot, in one query
+        existing_keys = set(
+            session.execute(
+                select(FactFollowersSnapshot.account_key).where(
+                    FactFollowersSnapshot.snapshot_date == today,
+                    FactFollowersSnapshot.account_key.in_(account_keys),
+                )
+            ).scalars()
+        )
+        pending_keys = [key for key in account_keys if key not in existing_keys]
 
-            # Scrape account
-            data = scraper.scrape(account)
+        if not pending_keys:
+            return _complete_platform_job(
+                session, job, platform, total_accounts, total_accounts
+            )
 
-            if data:
-                snapshot = FactFollowersSnapshot(
-                    account_key=account.account_key,
-                    snapshot_date=today,
-                    followers_count=data.get("followers_count", 0),
-                    following_count=data.get("following_count", 0),
-                    posts_count=data.get("posts_count", 0),
-                    likes_count=data.get("likes_count", 0),
-                    comments_count=data.get("comments_count", 0),
-                    shares_count=data.get("shares_count", 0),
-                    subscribers_count=data.get("subscribers_count", 0),  # For YouTube
-                    video_views=data.get("views_count", 0),  # For YouTube
-                    engagements_total=0,
-                )
-                snapshot.engagements_total = (
-                    snapshot.likes_count
-                    + snapshot.comments_count
-                    + snapshot.shares_count
-                )
-                session.add(snapshot)
-                processed += 1
+        # Scrape the remaining accounts in parallel across workers; the chord
+        # callback completes this job once every account has been handled
+        header = group(
+            scrape_platform_account.s(account_key, mode, db_path)
+            for account_key in pending_keys
+        )
+        callback = finish_platform_scrape.s(
+            job_id, platform, total_accounts, db_path=db_path
+        )
+        callback.on_error(fail_platform_scrape.s(job_id, db_path=db_path))
+        chord(header)(callback)
 
-        session.commit()
+        update_job_progress(
+            job_id,
+            20,
+            "running",
+            {"message": f"Queued {len(pending_keys)} {platform} accounts..."},
+        )
 
-        # Update job as completed
-        result_data = {
-            "status": "completed",
+        return {
+            "status": "dispatched",
             "platform": platform,
             "total_accounts": total_accounts,
-            "processed": processed,
-            "message": f"Successfully scraped {processed} accounts on {platform}",
+            "queued": len(pending_keys),
         }
 
-        job.status = "completed"
-        job.progress = 100.0
-        job.result = json.dumps(result_data)
-        job.completed_at = datetime.utcnow()
-        session.commit()
-
-        return result_data
-
     except Exception as exc:
         session.rollback()
 
-        from models.job import Job
-
         job = session.query(Job).filter_by(job_id=job_id).first()
         if job:
             job.status = "failed"
@@ -720,8 +807,108 @@ def scrape_platform(self, platform, mode="real", db_path=None):
         session.close()
 
 
+def _complete_platform_job(session, job, platform, total_accounts, processed):
+    """Mark a scrape_platform job completed and return its result."""
+    result_data = {
+        "status": "completed",
+        "platform": platform,
+        "total_accounts": total_accounts,
+        "processed": processed,
+        "message": f"Successfully scraped {processed} accounts on {platform}",
+    }
+
+    job.status = "completed"
+    job.progress = 100.0
+    job.result = json_dumps(result_data)
+    job.completed_at = datetime.utcnow()
+    session.commit()
+
+    return result_data
+
+
+@celery_app.task
+def scrape_platform_account(account_key, mode="real", db_path=None):
+    """
+    Scrape one account for scrape_platform and store today's snapshot.
+
+    Args:
+        account_key: The account key to scrape
+        mode: Scraper mode ('simulated' or 'real')
+        db_path: Path to database file
+
+    Returns:
+        bool: True if a snapshot was stored
+    """
+    session = get_db_session(db_path)
+    try:
+        account = session.get(DimAccount, account_key)
+        data = get_worker_scraper(mode).scrape(account) if account else None
+        if not data:
+            return False
+
+        snapshot = FactFollowersSnapshot(
+            account_key=account_key,
+            snapshot_date=date.today(),
+            **_snapshot_counts(data),
+        )
+        # Upsert: today's row may already exist from another scrape path
+        _upsert_snapshot(session, snapshot)
+        session.commit()
+        return True
+    finally:
+        session.close()
+
+
+@celery_app.task
+def finish_platform_scrape(stored, job_id, platform, total_accounts, db_path=None):
+    """
+    Chord callback completing a scrape_platform job.
+
+    Args:
+        stored: Results of the scrape_platform_account tasks
+        job_id: The scrape_platform job ID
+        platform: Platform name
+        total_accounts: Number of active accounts on the platform
+        db_path: Path to database file
+
+    Returns:
+        dict: Result with status and summary
+    """
+    # Accounts not dispatched already had today's snapshot
+    processed = total_accounts - len(stored) + sum(1 for ok in stored if ok)
+
+    session = get_db_session(db_path)
+    try:
+        job = session.query(Job).filter_by(job_id=job_id).first()
+        if not job:
+            logger.warning(f"scrape_platform job {job_id} not found")
+            return None
+        return _complete_platform_job(
+            session, job, platform, total_accounts, processed
+        )
+    finally:
+        session.close()
+
+
+@celery_app.task
+def fail_platform_scrape(request, exc, traceback, job_id, db_path=None):
+    """Error callback marking a scrape_platform job failed."""
+    session = get_db_session(db_path)
+    try:
+        job = session.query(Job).filter_by(job_id=job_id).first()
+        if job:
+            job.status = "failed"
+            job.error_message = str(exc)[:500]
+            job.completed_at = datetime.utcnow()
+            session.commit()
+    finally:
+        session.close()
+
+
 @celery_app.task(bind=True, max_retries=2, default_retry_delay=120)
-def scrape_selected_accounts(self, account_keys, mode="real", db_path=None):
+def scrape_selected_accounts(
+    self, account_keys, mode="real", db_path=None, job_pre_created=False
+):
     """
     Scrape metrics for specific accounts.
 
@@ -729,6 +916,7 @@ def scrape_selected_accounts(self, account_keys, mode="real", db_path=None):
         account_keys: List of account keys to scrape
         mode: Scraper mode ('simulated' or 'real')
         db_path: Path to database file
+        job_pre_created: True if the enqueuer already inserted the job row
 
     Returns:
         dict: Result with status and summary
@@ -744,29 +932,32 @@ def scrape_selected_accounts(self, account_keys, mode="real", db_path=None):
 
     try:
         # Create or update job record
-        from models.job import Job
+        if not (job_pre_created and _mark_job_running(session, job_id)):
+            job = session.query(Job).filter_by(job_id=job_id).first()
+            if not job:
+                job = Job(
+                    job_id=job_id,
+                    job_type="scrape_selected",
+                    status="running",
+                    started_at=datetime.utcnow(),
+                )
+                session.add(job)
+            else:
+                job.status = "running"
+                job.started_at = datetime.utcnow()
+            session.commit()
 
-        job = session.query(Job).filter_by(job_id=job_id).first()
-        if not job:
-            job = Job(
-                job_id=job_id,
-                job_type="scrape_selected",
-                status="running",
-                started_at=datetime.utcnow(),
+        # Get the requested account keys that exist
+        found_keys = (
+            session.execute(
+                select(DimAccount.account_key).where(
+                    DimAccount.account_key.in_(account_keys)
+                )
             )
-            session.add(job)
-        else:
-            job.status = "running"
-            job.started_at = datetime.utcnow()
-        session.commit()
-
-        # Get accounts
-        accounts = (
-            session.query(DimAccount)
-            .filter(DimAccount.account_key.in_(account_keys))
+            .scalars()
             .all()
         )
-        total_accounts = len(accounts)
+        total_accounts = len(found_keys)
 
         if total_accounts == 0:
             raise ValueError(
@@ -774,7 +965,6 @@ def scrape_selected_accounts(self, account_keys, mode="real", db_path=None):
             )
 
         if total_accounts != len(account_keys):
-            found_keys = [a.account_key for a in accounts]
             missing_keys = [k for k in account_keys if k not in found_keys]
             logger.warning(f"Some account keys not found: {missing_keys}")
 
@@ -783,13 +973,6 @@ def scrape_selected_accounts(self, account_keys, mode="real", db_path=None):
         )
 
         # Update progress
-        self.update_state(
-            state="PROGRESS",
-            meta={
-                "progress": 10,
-                "message": f"Starting scrape for {total_accounts} selected accounts...",
-            },
-        )
         update_job_progress(
             job_id,
             10,
@@ -801,58 +984,27 @@ def scrape_selected_accounts(self, account_keys, mode="real", db_path=None):
         session.close()  # Close before calling simulate_metrics which creates its own session
 
         # Update progress before starting
-        self.update_state(
-            state="PROGRESS", meta={"progress": 20, "message": "Running scraper..."}
-        )
         update_job_progress(job_id, 20, "running", {"message": "Running scraper..."})
 
         # Progress callback to update job progress
-        def progress_callback(processed, total, current_account, speed, elapsed):
-            progress = 20 + int((processed / total) * 70)  # 20-90% range
-            eta_seconds = (total - processed) / speed if speed > 0 else 0
-            eta_str = (
-                f"{int(eta_seconds // 60)}m {int(eta_seconds % 60)}s"
-                if eta_seconds > 0
-                else "--"
-            )
-
-            meta = {
-                "progress": progress,
-                "message": f"Scraping {current_account}... ({processed}/{total})",
-                "processed": processed,
-                "total": total,
-                "speed": round(speed, 2),
-                "elapsed": round(elapsed, 1),
-                "eta": eta_str,
-            }
-            self.update_state(state="PROGRESS", meta=meta)
-            update_job_progress(job_id, progress, "running", meta)
+        progress_callback = _job_progress_callback(job_id)
 
         # Optimize: Use more workers for better parallelization (up to 10)
-        import os
-
         max_workers = min(10, int(os.getenv("SCRAPER_MAX_WORKERS", "8")))
-        from scraper.collect_metrics import simulate_metrics
-
+        # Small selections run serially; pool startup outweighs the work
+        parallel_threshold = int(os.getenv("SCRAPER_PARALLEL_THRESHOLD", "4"))
         simulate_metrics(
             db_path=db_path,
             mode=mode,
-            parallel=True,
-            max_workers=max_workers,
+            parallel=total_accounts > parallel_threshold,
+            max_workers=min(total_accounts, max_workers),
             progress_callback=progress_callback,
             account_keys=account_keys,
         )
 
         # Update progress after completion
-        self.update_state(
-            state="PROGRESS", meta={"progress": 90, "message": "Finalizing..."}
-        )
         update_job_progress(job_id, 90, "running", {"message": "Finalizing..."})
 
-        # Reopen session for job update
-        session = get_db_session(db_path)
-        job = session.query(Job).filter_by(job_id=job_id).first()
-
         # Update job as completed
         result_data = {
             "status": "completed",
@@ -860,27 +1012,14 @@ def scrape_selected_accounts(self, account_keys, mode="real", db_path=None):
             "account_keys": account_keys,
             "message": f"Successfully scraped {total_accounts} selected accounts",
         }
-
-        job.status = "completed"
-        job.progress = 100.0
-        job.result = json.dumps(result_data)
-        job.completed_at = datetime.utcnow()
-        session.commit()
+        _finish_job(job_id, result_data, db_path)
 
         return result_data
 
     except Exception as exc:
-        if "session" in locals():
-            session.rollback()
-            from models.job import Job
-
-            job = session.query(Job).filter_by(job_id=job_id).first()
-            if job:
-                job.status = "failed"
-                job.error_message = str(exc)
-                job.completed_at = datetime.utcnow()
-                session.commit()
-            session.close()
+        session.rollback()
+        session.close()
+        _fail_job(job_id, exc, db_path)
 
         # Retry if we haven't exceeded max retries
         if self.request.retries < self.max_retries:
@@ -889,29 +1028,22 @@ def scrape_selected_accounts(self, account_keys, mode="real", db_path=None):
             raise exc
 
 
-@celery_app.task(bind=True, max_retries=2, default_retry_delay=300)
-def backfill_account(self, account_key, days=365, db_path=None):
+def _start_backfill_job(job_id, account_key, db_path):
     """
-    Backfill historical data for a specific account.
+    Mark a backfill_account job running and look up the account handle.
 
     Args:
+        job_id: Celery task ID of the job
         account_key: The account key to backfill
-        days: Number of days to backfill (default 365)
         db_path: Path to database file
 
     Returns:
-        dict: Result with status and summary
-    """
-    if db_path is None:
-        db_path = os.getenv("DB_PATH", "social_media.db")
-
-    job_id = self.request.id
-    session = get_db_session(db_path)
-
-    try:
-        # Create or update job record
-        from models.job import Job
+        str: The account's handle
 
+    Raises:
+        ValueError: If the account does not exist
+    """
+    with closing(get_db_session(db_path)) as session:
         job = session.query(Job).filter_by(job_id=job_id).first()
         if not job:
             job = Job(
@@ -927,67 +1059,64 @@ def backfill_account(self, account_key, days=365, db_path=None):
             job.started_at = datetime.utcnow()
         session.commit()
 
-        # Get account
-        account = session.query(DimAccount).filter_by(account_key=account_key).first()
-        if not account:
+        handle = session.execute(
+            select(DimAccount.handle).where(DimAccount.account_key == account_key)
+        ).scalar_one_or_none()
+        if handle is None:
             raise ValueError(f"Account with key {account_key} not found")
+        return handle
+
+
+@celery_app.task(bind=True, max_retries=2, default_retry_delay=300)
+def backfill_account(self, account_key, days=365, db_path=None):
+    """
+    Backfill historical data for a specific account.
+
+    Args:
+        account_key: The account key to backfill
+        days: Number of days to backfill (default 365)
+        db_path: Path to database file
+
+    Returns:
+        dict: Result with status and summary
+    """
+    if db_path is None:
+        db_path = os.getenv("DB_PATH", "social_media.db")
+
+    job_id = self.request.id
+
+    try:
+        handle = _start_backfill_job(job_id, account_key, db_path)
 
         # Update progress
-        self.update_state(
-            state="PROGRESS",
-            meta={
-                "progress": 10,
-                "message": f"Starting backfill for {account.handle}...",
-            },
-        )
         update_job_progress(
             job_id,
             10,
             "running",
-            {"message": f"Starting backfill for {account.handle}..."},
+            {"message": f"Starting backfill for {handle}..."},
         )
 
-        # Close session before calling backfill_history which creates its own session
-        session.close()
-
-        # Use the existing backfill function (but we need to modify it to work with single account)
-        # For now, we'll call the full backfill and it will handle all accounts
-        # In a production system, you'd want a single-account backfill function
-        backfill_history(db_path=db_path, days_back=days)
-
-        # Reopen session for job update
-        session = get_db_session(db_path)
-        job = session.query(Job).filter_by(job_id=job_id).first()
+        # Backfill only this account's history
+        backfill_history(
+            db_path=db_path,
+            days_back=days,
+            batch_size=100,
+            account_keys=[account_key],
+        )
 
-        # Update job as completed
         result_data = {
             "status": "completed",
             "account_key": account_key,
-            "account_handle": account.handle,
+            "account_handle": handle,
             "days": days,
-            "message": f"Successfully backfilled {days} days of history for {account.handle}",
+            "message": f"Successfully backfilled {days} days of history for {handle}",
         }
-
-        job.status = "completed"
-        job.progress = 100.0
-        job.result = json.dumps(result_data)
-        job.completed_at = datetime.utcnow()
-        session.commit()
+        _finish_job(job_id, result_data, db_path)
 
         return result_data
 
     except Exception as exc:
-        if "session" in locals():
-            session.rollback()
-            from models.job import Job
-
-            job = session.query(Job).filter_by(job_id=job_id).first()
-            if job:
-                job.status = "failed"
-                job.error_message = str(exc)
-                job.completed_at = datetime.utcnow()
-                session.commit()
-            session.close()
+        _fail_job(job_id, exc, db_path)
 
         # Retry if we haven't exceeded max retries
         if self.request.retries < self.max_retries:
@@ -2,9 +2,20 @@
 Utility functions for task processing.
 """
 import os
+import json
 import logging
+from datetime import datetime
+from celery.signals import worker_process_init, worker_process_shutdown
+from sqlalchemy import insert, update
 from sqlalchemy.orm import sessionmaker
+from models.job import Job
 from scraper.schema import init_db
+from scraper.scrapers import get_scraper
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -12,52 +23,173 @@ logger = logging.getLogger(__name__)
 # Cache engines per db_path to avoid recreating them
 _engine_cache = {}
 
+# Cache session factories per db_path alongside their engines
+_sessionmaker_cache = {}
+
+# Last (progress, status) written per job, so update_job_progress can skip
+# writes that change nothing meaningful; bounded because jobs finished outside
+# update_job_progress never clear their entry
+_last_progress = {}
+_LAST_PROGRESS_MAX = 1024
+
+# Terminal job statuses; reaching one always writes and forgets the job
+_TERMINAL_STATUSES = frozenset({"completed", "failed", "cancelled"})
+
+# Cache scrapers per mode so platform scrapers and their HTTP sessions are
+# reused across tasks in the same worker process
+_scraper_cache = {}
+
 
 def get_db_session(db_path=None):
     """
     Get a database session for tasks.
-    Reuses engines to improve performance.
+    Reuses engines and session factories to improve performance.
+
+    Sessions do not expire objects on commit, so reading a job after
+    committing it does not issue another SELECT.
     """
     if db_path is None:
         db_path = os.getenv("DB_PATH", "social_media.db")
 
-    # Reuse engine if available
-    if db_path not in _engine_cache:
-        _engine_cache[db_path] = init_db(db_path)
+    # Reuse engine and session factory if available
+    if db_path not in _sessionmaker_cache:
+        if db_path not in _engine_cache:
+            _engine_cache[db_path] = init_db(db_path)
+        _sessionmaker_cache[db_path] = sessionmaker(
+            bind=_engine_cache[db_path], expire_on_commit=False
+        )
+
+    return _sessionmaker_cache[db_path]()
+
+
+def get_worker_scraper(mode="real"):
+    """
+    Get the scraper for a mode, building it once per worker process.
+
+    Args:
+        mode: Scraper mode ('simulated' or 'real')
+
+    Returns:
+        Scraper instance shared by tasks in this process
+    """
+    if mode not in _scraper_cache:
+        _scraper_cache[mode] = get_scraper(mode)
+    return _scraper_cache[mode]
+
+
+@worker_process_init.connect
+def _reset_engines_after_fork(**kwargs):
+    """
+    Give each forked worker process its own connection pools.
+
+    Engines built before the fork keep their settings and session factories,
+    but connections inherited from the parent are dropped without being
+    closed so the parent's sockets are left alone.
+    """
+    for engine in _engine_cache.values():
+        engine.dispose(close=False)
+
+
+@worker_process_init.connect
+def _warm_default_engine(**kwargs):
+    """
+    Build the default engine and open one pooled connection at worker boot.
+
+    Keeps init_db and the first connect off the first task's critical path.
+    """
+    try:
+        session = get_db_session()
+        try:
+            session.connection()
+        finally:
+            session.close()
+    except Exception as e:
+        logger.warning(f"Could not pre-warm database engine: {e}")
+
+
+@worker_process_init.connect
+def _reset_scrapers_after_fork(**kwargs):
+    """Drop scrapers built before the fork so HTTP sessions are not shared."""
+    _scraper_cache.clear()
+
 
-    engine = _engine_cache[db_path]
-    Session = sessionmaker(bind=engine)
-    return Session()
+@worker_process_shutdown.connect
+def _dispose_engines(**kwargs):
+    """Close pooled connections when a worker process exits."""
+    for engine in _engine_cache.values():
+        engine.dispose()
+
+
+def json_dumps(data):
+    """
+    Serialize data to a JSON string, using orjson when it is installed.
+
+    Falls back to json.dumps for values orjson rejects (e.g. non-str keys).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(data)
+
+
+def json_loads(data):
+    """Parse a JSON string or bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 def update_job_progress(job_id, progress, status="PROGRESS", meta=None):
     """
     Update job progress in the database.
 
+    Updates without meta that keep the status and move progress by less
+    than one point are skipped; terminal statuses and 100% always write.
+
     Args:
         job_id: Celery task ID
         progress: Progress percentage (0-100)
         status: Job status (pending, running, completed, failed, cancelled)
         meta: Optional metadata to store in result field
     """
-    from models.job import Job
-
     session = None
     try:
+        values = {
+            "progress": min(100.0, max(0.0, float(progress))),  # Clamp between 0-100
+            "status": status.lower() if isinstance(status, str) else status,
+        }
+        last = _last_progress.get(job_id)
+        if (
+            last is not None
+            and not meta
+            and last[1] == values["status"]
+            and abs(values["progress"] - last[0]) < 1.0
+            and values["progress"] < 100.0
+        ):
+            return
+        if meta:
+            try:
+                values["result"] = json_dumps(meta)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Failed to serialize job meta for {job_id}: {e}")
+                values["result"] = str(meta)
+
         session = get_db_session()
-        job = session.query(Job).filter_by(job_id=job_id).first()
-        if job:
-            job.progress = min(100.0, max(0.0, float(progress)))  # Clamp between 0-100
-            job.status = status.lower() if isinstance(status, str) else status
-            if meta:
-                import json
-
-                try:
-                    job.result = json.dumps(meta)
-                except (TypeError, ValueError) as e:
-                    logger.warning(f"Failed to serialize job meta for {job_id}: {e}")
-                    job.result = str(meta)
-            session.commit()
+        # Single UPDATE instead of loading the job first; progress callbacks
+        # call this for every emitted update
+        updated = session.execute(
+            update(Job).where(Job.job_id == job_id).values(**values)
+        ).rowcount
+        session.commit()
+        if values["status"] in _TERMINAL_STATUSES:
+            _last_progress.pop(job_id, None)
+        else:
+            if len(_last_progress) >= _LAST_PROGRESS_MAX:
+                _last_progress.clear()
+            _last_progress[job_id] = (values["progress"], values["status"])
+        if updated:
             logger.debug(
                 f"Updated job {job_id} progress to {progress}% with status {status}"
             )
@@ -72,7 +204,9 @@ def update_job_progress(job_id, progress, status="PROGRESS", meta=None):
             session.close()
 
 
-def create_job_record(job_id, job_type, account_key=None, platform=None, db_path=None):
+def create_job_record(
+    job_id, job_type, account_key=None, platform=None, db_path=None, session=None
+):
     """
     Create a job record in the database.
 
@@ -82,16 +216,16 @@ def create_job_record(job_id, job_type, account_key=None, platform=None, db_path
         account_key: Optional account key
         platform: Optional platform name
         db_path: Optional database path
+        session: Optional session to create the job in; it is committed but
+            left open, and the returned job stays bound to it
 
     Returns:
         Job: The created job object
     """
-    from models.job import Job
-    from datetime import datetime
-
-    session = None
+    owns_session = session is None
     try:
-        session = get_db_session(db_path)
+        if owns_session:
+            session = get_db_session(db_path)
         job = Job(
             job_id=job_id,
             job_type=job_type,
@@ -111,5 +245,59 @@ def create_job_record(job_id, job_type, account_key=None, platform=None, db_path
         logger.error(f"Error creating job record {job_id}: {e}", exc_info=True)
         raise
     finally:
+        if owns_session and session:
+            session.close()
+
+
+def create_job_records(records, db_path=None, session=None, batch_size=None):
+    """
+    Create many job records with executemany INSERTs in one transaction.
+
+    For fan-out callers that would otherwise call create_job_record once
+    per queued task.
+
+    Args:
+        records: Iterable of dicts with ``job_id`` and ``job_type`` and
+            optionally ``account_key``, ``platform`` or any other Job
+            column; ``status`` defaults to ``"pending"``
+        db_path: Optional database path
+        session: Optional session to create the jobs in; it is committed
+            but left open
+        batch_size: Rows per INSERT statement (None inserts all at once)
+
+    Returns:
+        int: Number of job records created
+    """
+    now = datetime.utcnow()
+    rows = [
+        {
+            "status": "pending",
+            "progress": 0.0,
+            "account_key": None,
+            "platform": None,
+            "created_at": now,
+            **record,
+        }
+        for record in records
+    ]
+    if not rows:
+        return 0
+
+    owns_session = session is None
+    batch_size = batch_size or len(rows)
+    try:
+        if owns_session:
+            session = get_db_session(db_path)
+        for start in range(0, len(rows), batch_size):
+            session.execute(insert(Job), rows[start : start + batch_size])
+        session.commit()
+        logger.info(f"Created {len(rows)} job records")
+        return len(rows)
+    except Exception as e:
         if session:
+            session.rollback()
+        logger.error(f"Error creating {len(rows)} job records: {e}", exc_info=True)
+        raise
+    finally:
+        if owns_session and session:
             session.close()
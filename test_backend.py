@@ -1,13 +1,18 @@
 import requests
 import sys
+from requests.adapters import HTTPAdapter
 
 
 def test_backend():
     base_url = "http://127.0.0.1:5000"
 
+    # One keep-alive session so both calls share a pooled connection
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+
     print("Testing /api/summary...")
     try:
-        resp = requests.get(f"{base_url}/api/summary")
+        resp = session.get(f"{base_url}/api/summary")
         if resp.status_code == 200:
             data = resp.json()
             print(f"SUCCESS: Retrieved {len(data)} accounts.")
@@ -17,7 +22,7 @@ def test_backend():
 
                 # Test History
                 print(f"Testing /api/history/{first['platform']}/{first['handle']}...")
-                hist_resp = requests.get(
+                hist_resp = session.get(
                     f"{base_url}/api/history/{first['platform']}/{first['handle']}"
                 )
                 if hist_resp.status_code == 200:
@@ -34,6 +39,8 @@ def test_backend():
 
     except requests.exceptions.ConnectionError:
         print("FAILURE: Could not connect to backend. Is it running?")
+    finally:
+        session.close()
 
 
 if __name__ == "__main__":
@@ -3,10 +3,19 @@ A/B Testing Framework.
 
 Framework for A/B testing new features and changes.
 """
+import hashlib
 import pytest
 import random
 
 
+def _assign_variant(user_id, test_name):
+    """Assign a user to variant A or B, stable across processes."""
+    digest = hashlib.blake2b(
+        user_id.encode(), digest_size=8, person=test_name.encode()[:16]
+    ).digest()
+    return "A" if digest[-1] & 1 == 0 else "B"
+
+
 class TestABTestingFramework:
     """A/B testing framework tests."""
 
@@ -16,14 +25,15 @@ class TestABTestingFramework:
         user_id = "test_user_123"
         test_name = "new_feature"
 
-        # Deterministic assignment based on user_id
-        assignment = "A" if hash(user_id + test_name) % 2 == 0 else "B"
+        # Deterministic assignment based on user_id (builtin hash() is salted
+        # per process by PYTHONHASHSEED, so a keyed digest is used instead)
+        assignment = _assign_variant(user_id, test_name)
 
         # Should assign consistently
         assert assignment in ["A", "B"]
 
         # Same user should get same assignment
-        assignment2 = "A" if hash(user_id + test_name) % 2 == 0 else "B"
+        assignment2 = _assign_variant(user_id, test_name)
         assert assignment == assignment2
 
     def test_ab_test_metrics_tracking(self):
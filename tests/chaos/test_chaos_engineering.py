@@ -10,6 +10,7 @@ from scraper.scrapers import SimulatedScraper, RealScraper
 from scraper.collect_metrics import simulate_metrics
 from scraper.schema import DimAccount, FactFollowersSnapshot
 from datetime import date
+from sqlalchemy import insert
 import time
 
 
@@ -111,13 +112,14 @@ class TestMemoryFailureInjection:
 
     def test_large_dataset_handling(self, db_session):
         """Test system can handle large datasets."""
-        # Create many accounts
-        accounts = []
-        for i in range(100):
-            account = DimAccount(platform="X", handle=f"test_{i}", org_name="HHS")
-            accounts.append(account)
-            db_session.add(account)
-
+        # Create many accounts in a single executemany
+        db_session.execute(
+            insert(DimAccount),
+            [
+                {"platform": "X", "handle": f"test_{i}", "org_name": "HHS"}
+                for i in range(100)
+            ],
+        )
         db_session.commit()
 
         # Query all accounts
@@ -216,10 +218,8 @@ class TestServiceDegradation:
         from scraper.collect_metrics import simulate_metrics
         from scraper.schema import DimAccount, init_db
         from sqlalchemy.orm import sessionmaker
-        from sqlalchemy import create_engine
 
-        engine = create_engine(f"sqlite:///{test_db_path}")
-        init_db(test_db_path)
+        engine = init_db(test_db_path)
         Session = sessionmaker(bind=engine)
         session = Session()
 
@@ -250,22 +250,24 @@ class TestPartialFailureScenarios:
         from scraper.collect_metrics import simulate_metrics
         from scraper.schema import DimAccount, init_db
         from sqlalchemy.orm import sessionmaker
-        from sqlalchemy import create_engine
 
-        engine = create_engine(f"sqlite:///{test_db_path}")
-        init_db(test_db_path)
+        engine = init_db(test_db_path)
         Session = sessionmaker(bind=engine)
         session = Session()
 
         # Create multiple accounts
-        for i in range(5):
-            account = DimAccount(
-                platform="X",
-                handle=f"test_{i}",
-                org_name="HHS",
-                account_url=f"https://x.com/test_{i}",
-            )
-            session.add(account)
+        session.execute(
+            insert(DimAccount),
+            [
+                {
+                    "platform": "X",
+                    "handle": f"test_{i}",
+                    "org_name": "HHS",
+                    "account_url": f"https://x.com/test_{i}",
+                }
+                for i in range(5)
+            ],
+        )
         session.commit()
         session.close()
 
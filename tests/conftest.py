@@ -2,7 +2,7 @@ import pytest
 import os
 import tempfile
 from datetime import date
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, insert
 from sqlalchemy.orm import sessionmaker
 from flask import Flask
 
@@ -39,13 +39,40 @@ def test_db_path():
         os.unlink(path)
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def db_engine(test_db_path):
-    """Create a test database engine."""
+    """Create a test database engine with all tables, once per test run."""
     engine = create_engine(f"sqlite:///{test_db_path}")
     Base.metadata.create_all(engine)
     yield engine
-    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+def _clear_tables(engine):
+    """Delete all rows from every table, children first, in one transaction."""
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+
+
+@pytest.fixture(autouse=True)
+def _clean_db(request):
+    """
+    Empty the test database around each test that uses it.
+
+    Covers tests that only take test_db_path and open it with init_db; they
+    may also replace the file, so pooled connections are dropped afterwards
+    and missing tables recreated before clearing.
+    """
+    if not {"db_engine", "test_db_path"} & set(request.fixturenames):
+        yield
+        return
+    engine = request.getfixturevalue("db_engine")
+    _clear_tables(engine)
+    yield
+    engine.dispose()
+    Base.metadata.create_all(engine)
+    _clear_tables(engine)
 
 
 @pytest.fixture(scope="function")
@@ -53,30 +80,23 @@ def db_session(db_engine):
     """Create a test database session."""
     Session = sessionmaker(bind=db_engine)
     session = Session()
-    # Clear any existing data
-    from scraper.schema import FactSocialPost, FactFollowersSnapshot, DimAccount
-
-    session.query(FactSocialPost).delete()
-    session.query(FactFollowersSnapshot).delete()
-    session.query(DimAccount).delete()
-    session.commit()
     yield session
     session.rollback()
     session.close()
 
 
 @pytest.fixture
-def app(test_db_path):
+def app(test_db_path, db_engine):
     """Create Flask test app with test database."""
     flask_app.config["TESTING"] = True
     flask_app.config["DATABASE"] = test_db_path
 
     if APP_AVAILABLE:
-        # Override get_db_session to use test database
+        # Override get_db_session to use test database; requests share the
+        # session-scoped engine instead of building one (and its DDL) per call
+        Session = sessionmaker(bind=db_engine)
+
         def get_test_db_session():
-            engine = create_engine(f"sqlite:///{test_db_path}")
-            Base.metadata.create_all(engine)
-            Session = sessionmaker(bind=engine)
             return Session()
 
         # Monkey patch the get_db_session function
@@ -140,22 +160,23 @@ def sample_snapshot(db_session, sample_account):
 @pytest.fixture
 def multiple_accounts(db_session):
     """Create multiple sample accounts for testing."""
-    accounts = []
     platforms = ["X", "Instagram", "Facebook", "YouTube"]
-    for i, platform in enumerate(platforms):
-        account = DimAccount(
-            platform=platform,
-            handle=f"test_handle_{i}",
-            org_name="HHS" if i == 0 else "NIH",
-            account_display_name=f"Test on {platform}",
-            account_url=f"https://{platform.lower()}.com/test_handle_{i}",
-            is_core_account=(i == 0),
-        )
-        db_session.add(account)
-        accounts.append(account)
+    rows = [
+        {
+            "platform": platform,
+            "handle": f"test_handle_{i}",
+            "org_name": "HHS" if i == 0 else "NIH",
+            "account_display_name": f"Test on {platform}",
+            "account_url": f"https://{platform.lower()}.com/test_handle_{i}",
+            "is_core_account": (i == 0),
+        }
+        for i, platform in enumerate(platforms)
+    ]
+    # One INSERT ... RETURNING instead of an add and refresh per account
+    accounts = db_session.scalars(
+        insert(DimAccount).returning(DimAccount, sort_by_parameter_order=True), rows
+    ).all()
     db_session.commit()
-    for account in accounts:
-        db_session.refresh(account)
     return accounts
 
 
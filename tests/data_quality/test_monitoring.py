@@ -5,6 +5,7 @@ Tests for continuous data quality monitoring and alerting.
 """
 import pytest
 from datetime import date, timedelta
+from sqlalchemy import exists, func, insert, select
 from scraper.schema import DimAccount, FactFollowersSnapshot
 
 
@@ -105,11 +106,12 @@ class TestQualityThresholds:
             "has_followers": snapshot.followers_count is not None,
             "has_engagement": snapshot.engagements_total is not None,
             "is_recent": (date.today() - snapshot.snapshot_date).days <= 7,
-            "is_consistent": snapshot.engagements_total
-            == (
-                (snapshot.likes_count or 0)
-                + (snapshot.comments_count or 0)
-                + (snapshot.shares_count or 0)
+            "is_consistent": not db_session.scalar(
+                select(func.count()).where(
+                    FactFollowersSnapshot.snapshot_id == snapshot.snapshot_id,
+                    FactFollowersSnapshot.engagements_total
+                    != FactFollowersSnapshot.calculated_engagement,
+                )
             ),
         }
 
@@ -125,18 +127,17 @@ class TestQualityThresholds:
 
         # Check for stale data
         today = date.today()
-        recent_snapshots = (
-            db_session.query(FactFollowersSnapshot)
-            .filter(
-                FactFollowersSnapshot.account_key == account.account_key,
-                FactFollowersSnapshot.snapshot_date >= today - timedelta(days=7),
+        has_recent_snapshots = db_session.scalar(
+            select(
+                exists().where(
+                    FactFollowersSnapshot.account_key == account.account_key,
+                    FactFollowersSnapshot.snapshot_date >= today - timedelta(days=7),
+                )
             )
-            .count()
         )
 
-        # Should alert if no recent snapshots
-        should_alert = recent_snapshots == 0
-        # This is informational - no assertion, just monitoring
+        # An account with no snapshot in the last week should alert
+        assert not has_recent_snapshots
 
 
 class TestQualityReporting:
@@ -145,24 +146,29 @@ class TestQualityReporting:
     def test_generate_quality_report(self, db_session):
         """Generate data quality report."""
         # Create test data
-        accounts = []
-        for i in range(10):
-            account = DimAccount(
-                platform="X", handle=f"quality_report_{i}", org_name="HHS"
-            )
-            db_session.add(account)
-            accounts.append(account)
-        db_session.commit()
+        account_keys = db_session.scalars(
+            insert(DimAccount).returning(
+                DimAccount.account_key, sort_by_parameter_order=True
+            ),
+            [
+                {"platform": "X", "handle": f"quality_report_{i}", "org_name": "HHS"}
+                for i in range(10)
+            ],
+        ).all()
 
         # Create snapshots
         today = date.today()
-        for account in accounts:
-            snapshot = FactFollowersSnapshot(
-                account_key=account.account_key,
-                snapshot_date=today,
-                followers_count=1000,
-            )
-            db_session.add(snapshot)
+        db_session.execute(
+            insert(FactFollowersSnapshot),
+            [
+                {
+                    "account_key": account_key,
+                    "snapshot_date": today,
+                    "followers_count": 1000,
+                }
+                for account_key in account_keys
+            ],
+        )
         db_session.commit()
 
         # Generate quality report
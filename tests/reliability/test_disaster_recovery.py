@@ -6,6 +6,7 @@ Tests for backup, restore, and disaster recovery procedures.
 import pytest
 import os
 import shutil
+import sqlite3
 import tempfile
 from datetime import date
 from scraper.schema import DimAccount, FactFollowersSnapshot, init_db
@@ -13,6 +14,22 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy import create_engine
 
 
+def _backup_sqlite(source_path, backup_path):
+    """
+    Copy a SQLite database with the online backup API.
+
+    init_db enables WAL, so committed pages can still sit in the -wal file
+    and a plain file copy of the .db would miss them.
+    """
+    source = sqlite3.connect(source_path)
+    target = sqlite3.connect(backup_path)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+
+
 class TestBackupProcedures:
     """Test backup and restore procedures."""
 
@@ -31,7 +48,7 @@ class TestBackupProcedures:
 
         # Create backup
         backup_path = test_db_path + ".backup"
-        shutil.copy2(test_db_path, backup_path)
+        _backup_sqlite(test_db_path, backup_path)
 
         # Verify backup exists
         assert os.path.exists(backup_path)
@@ -65,13 +82,15 @@ class TestBackupProcedures:
 
         # Create backup
         backup_path = test_db_path + ".backup"
-        shutil.copy2(test_db_path, backup_path)
+        _backup_sqlite(test_db_path, backup_path)
 
-        # "Corrupt" original (delete it)
-        os.unlink(test_db_path)
+        # "Corrupt" original (delete it, along with its WAL sidecar files)
+        for path in (test_db_path, test_db_path + "-wal", test_db_path + "-shm"):
+            if os.path.exists(path):
+                os.unlink(path)
 
         # Restore from backup
-        shutil.copy2(backup_path, test_db_path)
+        _backup_sqlite(backup_path, test_db_path)
 
         # Verify restore
         restored_engine = create_engine(f"sqlite:///{test_db_path}")
@@ -204,8 +223,10 @@ class TestDisasterScenarios:
         session.commit()
         session.close()
 
-        # Simulate complete loss
-        os.unlink(test_db_path)
+        # Simulate complete loss (database plus its WAL sidecar files)
+        for path in (test_db_path, test_db_path + "-wal", test_db_path + "-shm"):
+            if os.path.exists(path):
+                os.unlink(path)
         assert not os.path.exists(test_db_path)
 
         # Recreate database
@@ -233,7 +254,7 @@ class TestDisasterScenarios:
 
         # Create backup before corruption
         backup_path = test_db_path + ".backup"
-        shutil.copy2(test_db_path, backup_path)
+        _backup_sqlite(test_db_path, backup_path)
 
         # Simulate corruption (write garbage)
         with open(test_db_path, "wb") as f:
@@ -277,7 +298,7 @@ class TestRecoveryTimeObjectives:
         # Measure backup time
         start = time.time()
         backup_path = test_db_path + ".backup"
-        shutil.copy2(test_db_path, backup_path)
+        _backup_sqlite(test_db_path, backup_path)
         elapsed = time.time() - start
 
         # Should be fast (under 1 second for small DB)
@@ -295,7 +316,7 @@ class TestRecoveryTimeObjectives:
         engine = create_engine(f"sqlite:///{test_db_path}")
         init_db(test_db_path)
         backup_path = test_db_path + ".backup"
-        shutil.copy2(test_db_path, backup_path)
+        _backup_sqlite(test_db_path, backup_path)
 
         # Measure restore time
         start = time.time()
@@ -7,7 +7,7 @@ import pytest
 import time
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import date
+from datetime import date, timedelta
 from scraper.schema import DimAccount, FactFollowersSnapshot
 
 
@@ -86,7 +86,8 @@ class TestScaledLoad:
         for i in range(1000):
             snapshot = FactFollowersSnapshot(
                 account_key=account.account_key,
-                snapshot_date=date.fromordinal(date.today().toordinal() - (i % 365)),
+                # One snapshot per day: (account_key, snapshot_date) is unique
+                snapshot_date=date.today() - timedelta(days=i),
                 followers_count=1000 + i,
             )
             snapshots.append(snapshot)
@@ -233,3 +233,35 @@ class TestSimulateMetrics:
         snapshots = session.query(FactFollowersSnapshot).all()
         assert len(snapshots) == 5
         session.close()
+
+
+class TestSimulateMetricsResume:
+    """Test that simulate_metrics resumes from today's snapshots."""
+
+    def test_accounts_with_todays_snapshot_are_not_scraped(
+        self, monkeypatch, db_engine, db_session
+    ):
+        """Test that only accounts without a snapshot for today are scraped."""
+        from scraper import collect_metrics
+
+        done = DimAccount(account_key=1, platform="x", handle="done")
+        todo = DimAccount(account_key=2, platform="x", handle="todo")
+        db_session.add_all([done, todo])
+        db_session.add(
+            FactFollowersSnapshot(
+                account_key=1, snapshot_date=date.today(), followers_count=1
+            )
+        )
+        db_session.commit()
+
+        scraper = MagicMock()
+        scraper.scrape.return_value = None
+        monkeypatch.setattr(collect_metrics, "init_db", lambda db_path: db_engine)
+        monkeypatch.setattr(
+            collect_metrics, "get_scraper", lambda mode, **kwargs: scraper
+        )
+
+        simulate_metrics(db_path="unused.db", mode="real", parallel=False)
+
+        scraped = [call.args[0].handle for call in scraper.scrape.call_args_list]
+        assert scraped == ["todo"]
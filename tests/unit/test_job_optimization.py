@@ -0,0 +1,180 @@
+import gzip
+import json
+import time
+
+from tasks.job_optimization import compress_job_result, decompress_job_result
+
+
+class TestJobResultCompression:
+    """Test job result compression helpers."""
+
+    def test_round_trip_dict(self):
+        """Test that a compressed dict decompresses to the same dict."""
+        data = {"status": "completed", "account_keys": list(range(200))}
+        compressed = compress_job_result(data)
+
+        assert isinstance(compressed, bytes)
+        assert decompress_job_result(compressed) == data
+
+    def test_round_trip_archive_level(self):
+        """Test that archival compression is readable by the normal reader."""
+        data = {"status": "completed", "message": "x" * 5000}
+        compressed = compress_job_result(data, archive=True)
+
+        assert len(compressed) < 5000
+        assert decompress_job_result(compressed) == data
+
+    def test_small_payload_stored_raw(self):
+        """Test that tiny results skip compression but still round-trip."""
+        data = {"status": "completed"}
+        compressed = compress_job_result(data)
+
+        assert compressed[:1] == b"R"
+        assert decompress_job_result(compressed) == data
+
+    def test_round_trip_non_str_keys(self):
+        """Test that dicts orjson rejects still serialize via json."""
+        data = {1: "a" * 300}
+        compressed = compress_job_result(data)
+
+        assert decompress_job_result(compressed) == {"1": "a" * 300}
+
+    def test_decompress_legacy_gzip(self):
+        """Test that blobs written before the codec prefix still decode."""
+        data = {"status": "failed", "error": "timeout"}
+        legacy = gzip.compress(json.dumps(data).encode("utf-8"))
+
+        assert decompress_job_result(legacy) == data
+
+    def test_decompress_garbage_returns_none(self):
+        """Test that unreadable data returns None instead of raising."""
+        assert decompress_job_result(b"?not a job result") is None
+
+    def test_round_trip_with_trained_dictionary(self, monkeypatch):
+        """Test that dictionary-compressed blobs decode with the same dictionary."""
+        import zstandard as zstd
+        from tasks import job_optimization
+
+        samples = [
+            json.dumps(
+                {"status": "completed", "account_key": i, "platform": "x"}
+            ).encode("utf-8")
+            for i in range(500)
+        ]
+        dict_data = zstd.train_dictionary(4096, samples).as_bytes()
+
+        monkeypatch.setattr(job_optimization, "_DICT_CHECKED_AT", time.monotonic())
+        for name in ("_DICT", "_DICT_CCTX", "_DICT_DCTX"):
+            monkeypatch.setattr(job_optimization, name, None)
+        job_optimization._set_dict(dict_data)
+
+        data = {"status": "completed", "account_key": 42, "platform": "x" * 300}
+        compressed = compress_job_result(data)
+
+        assert compressed[:1] == b"D"
+        assert decompress_job_result(compressed) == data
+
+
+    def _dict_bytes(self, field):
+        import zstandard as zstd
+
+        samples = [
+            json.dumps({"status": "completed", field: i}).encode("utf-8")
+            for i in range(500)
+        ]
+        return zstd.train_dictionary(4096, samples).as_bytes()
+
+    def test_stale_dictionary_is_reloaded_from_redis(self, monkeypatch):
+        """Test that a retrained dictionary is picked up after the refresh TTL."""
+        from unittest.mock import MagicMock
+        from tasks import job_optimization
+
+        old_dict, new_dict = self._dict_bytes("old"), self._dict_bytes("new")
+        client = MagicMock()
+        client.get.return_value = new_dict
+        monkeypatch.setattr(job_optimization, "_get_redis", lambda: client)
+        for name in ("_DICT", "_DICT_CCTX", "_DICT_DCTX"):
+            monkeypatch.setattr(job_optimization, name, None)
+        job_optimization._set_dict(old_dict)
+        monkeypatch.setattr(
+            job_optimization,
+            "_DICT_CHECKED_AT",
+            time.monotonic() - job_optimization.ZSTD_DICT_REFRESH_SECONDS - 1,
+        )
+
+        loaded = job_optimization._load_dict()
+
+        assert loaded.as_bytes() == new_dict
+        client.get.assert_called_once_with(job_optimization.ZSTD_DICT_REDIS_KEY)
+
+    def test_fresh_dictionary_skips_redis(self, monkeypatch):
+        """Test that Redis is not read again within the refresh TTL."""
+        from unittest.mock import MagicMock
+        from tasks import job_optimization
+
+        client = MagicMock()
+        monkeypatch.setattr(job_optimization, "_get_redis", lambda: client)
+        monkeypatch.setattr(job_optimization, "_DICT_CHECKED_AT", time.monotonic())
+
+        job_optimization._load_dict()
+
+        client.get.assert_not_called()
+
+
+class TestStreamJobResult:
+    """Test chunked streaming of stored job results."""
+
+    def test_stream_reassembles_result(self, monkeypatch, db_engine):
+        """Test that streamed chunks concatenate back to the stored result."""
+        from sqlalchemy.orm import sessionmaker
+        from models.job import Job
+        from tasks import job_optimization
+
+        Session = sessionmaker(bind=db_engine)
+        session = Session()
+        session.add(Job(job_id="stream-1", job_type="test", result="é" * 3000))
+        session.commit()
+        session.close()
+        monkeypatch.setattr(job_optimization, "get_db_session", Session)
+
+        chunks = list(job_optimization.stream_job_result("stream-1", chunk_size=1000))
+
+        assert all(isinstance(chunk, bytes) for chunk in chunks)
+        assert all(len(chunk) <= 1000 for chunk in chunks)
+        assert b"".join(chunks).decode("utf-8") == "é" * 3000
+
+
+class TestWriteBehindCache:
+    """Test write-behind job result caching."""
+
+    def test_cache_job_result_queues_task(self, monkeypatch):
+        """Test that cache_job_result enqueues instead of writing to Redis."""
+        from unittest.mock import MagicMock
+        from tasks import job_optimization
+
+        apply_async = MagicMock()
+        redis_factory = MagicMock()
+        monkeypatch.setattr(
+            job_optimization.cache_job_result_async, "apply_async", apply_async
+        )
+        monkeypatch.setattr(job_optimization, "_get_redis", redis_factory)
+
+        assert job_optimization.cache_job_result("a", {"n": 1}, ttl_seconds=60)
+
+        apply_async.assert_called_once()
+        assert apply_async.call_args.kwargs["args"] == ("a", {"n": 1}, 60)
+        redis_factory.assert_not_called()
+
+    def test_sync_variant_writes_compressed_result(self, monkeypatch):
+        """Test that cache_job_result_sync stores a decodable blob."""
+        from unittest.mock import MagicMock
+        from tasks import job_optimization
+
+        client = MagicMock()
+        monkeypatch.setattr(job_optimization, "_get_redis", lambda: client)
+
+        assert job_optimization.cache_job_result_sync("a", {"n": 1}, ttl_seconds=60)
+
+        key, ttl, blob = client.setex.call_args.args
+        assert (key, ttl) == ("job_result:a", 60)
+        assert decompress_job_result(blob) == {"n": 1}
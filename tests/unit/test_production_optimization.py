@@ -0,0 +1,121 @@
+from types import SimpleNamespace
+
+from tasks.production_optimization import should_retry_job
+
+
+def _job(error_message=None, status="failed"):
+    return SimpleNamespace(status=status, error_message=error_message)
+
+
+class TestShouldRetryJob:
+    """Test failure classification for job retries."""
+
+    def test_transient_errors_are_retried(self):
+        """Test that transient errors are retried regardless of case."""
+        for message in ("Read TIMEOUT", "HTTP 503 from upstream", "Rate limit hit"):
+            should_retry, reason = should_retry_job(_job(message))
+            assert should_retry is True
+            assert reason == "Transient error detected"
+
+    def test_permanent_errors_are_not_retried(self):
+        """Test that permanent errors stop retries."""
+        for message in ("Account not found", "HTTP 401", "Malformed payload"):
+            should_retry, reason = should_retry_job(_job(message))
+            assert should_retry is False
+            assert reason == "Permanent error detected"
+
+    def test_transient_takes_precedence_over_permanent(self):
+        """Test that a message matching both lists is treated as transient."""
+        should_retry, _ = should_retry_job(_job("connection invalid"))
+        assert should_retry is True
+
+    def test_cancelled_job_is_not_retried(self):
+        """Test that cancelled jobs are never retried."""
+        should_retry, reason = should_retry_job(_job("timeout", status="cancelled"))
+        assert should_retry is False
+        assert reason == "Job was cancelled"
+
+    def test_unknown_error_is_retried(self):
+        """Test that unclassified errors default to retry."""
+        assert should_retry_job(_job(None)) == (True, "Retry allowed")
+
+    def test_non_retryable_error_type_is_not_retried(self):
+        """Test that bad-input exception types stop retries."""
+        should_retry, reason = should_retry_job(_job("timeout"), "ValueError")
+        assert should_retry is False
+        assert reason == "Non-retryable error: ValueError"
+
+    def test_missing_job_record_is_classified(self):
+        """Test that a task without a job record can still be classified."""
+        assert should_retry_job(None, "ConnectionError") == (True, "Retry allowed")
+
+
+class TestWorkerTaskSnapshot:
+    """Test caching of worker inspect() replies."""
+
+    def test_snapshot_is_reused_within_ttl(self, monkeypatch):
+        """Test that repeated calls inside the TTL do not re-broadcast."""
+        from unittest.mock import MagicMock
+        from tasks import production_optimization
+
+        monkeypatch.setattr(production_optimization, "_worker_snapshot_cache", {})
+        app = MagicMock()
+        inspect = app.control.inspect.return_value
+        inspect.active.return_value = {"w1": [1, 2]}
+        inspect.reserved.return_value = {"w1": [3]}
+
+        first = production_optimization._get_worker_task_snapshot(app)
+        second = production_optimization._get_worker_task_snapshot(app)
+
+        assert first == second == ({"w1": [1, 2]}, {"w1": [3]})
+        inspect.active.assert_called_once()
+        inspect.reserved.assert_called_once()
+
+
+class TestOptimalHourFromRows:
+    """Test the numpy fallback for calculate_optimal_schedule_time."""
+
+    def test_picks_hour_with_lowest_average(self):
+        """Test that the hour with the fastest average duration wins."""
+        from datetime import datetime, timedelta
+        from tasks.production_optimization import _optimal_hour_from_rows
+
+        def row(hour, seconds):
+            start = datetime(2024, 1, 1, hour)
+            return (start, start + timedelta(seconds=seconds))
+
+        rows = [row(1, 100), row(1, 300), row(5, 150), row(5, 50), row(9, 400)]
+
+        assert _optimal_hour_from_rows(rows) == 5
+
+    def test_no_rows_returns_none(self):
+        """Test that empty history returns None."""
+        from tasks.production_optimization import _optimal_hour_from_rows
+
+        assert _optimal_hour_from_rows([]) is None
+
+
+class TestIntelligentBackoff:
+    """Test retry backoff delays."""
+
+    def test_delay_doubles_within_jitter(self):
+        """Test that the delay is base * 2**retries plus at most 20% jitter."""
+        from tasks.production_optimization import intelligent_backoff
+
+        for retries in range(4):
+            delay = intelligent_backoff(retries, base_delay=60)
+            expected = 60 * 2**retries
+            assert expected <= delay <= expected * 1.2
+
+    def test_delay_capped_at_max(self):
+        """Test that large retry counts stay within max_delay plus jitter."""
+        from tasks.production_optimization import intelligent_backoff
+
+        assert 3600 <= intelligent_backoff(20) <= 3600 * 1.2
+
+    def test_non_default_base(self):
+        """Test that non-power-of-two bases still use exponentiation."""
+        from tasks.production_optimization import intelligent_backoff
+
+        delay = intelligent_backoff(2, base_delay=10, exponential_base=3)
+        assert 90 <= delay <= 108
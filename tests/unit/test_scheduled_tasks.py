@@ -0,0 +1,132 @@
+import json
+from unittest.mock import MagicMock
+
+
+class TestHealthCheckCache:
+    """Test that health_check reuses its cached result."""
+
+    def test_cache_hit_skips_checks(self, monkeypatch):
+        """Test that a cached status is returned without running checks."""
+        from tasks import job_optimization, scheduled_tasks
+
+        client = MagicMock()
+        client.get.return_value = json.dumps({"status": "healthy", "checks": {}})
+        run_checks = MagicMock()
+        monkeypatch.setattr(job_optimization, "_get_redis", lambda: client)
+        monkeypatch.setattr(scheduled_tasks, "_run_health_checks", run_checks)
+
+        assert scheduled_tasks.health_check() == {"status": "healthy", "checks": {}}
+        run_checks.assert_not_called()
+
+    def test_cache_miss_runs_checks_and_stores(self, monkeypatch):
+        """Test that a miss runs the checks and caches them with a TTL."""
+        from tasks import job_optimization, scheduled_tasks
+
+        client = MagicMock()
+        client.get.return_value = None
+        status = {"status": "degraded", "checks": {"database": "ok"}}
+        monkeypatch.setattr(job_optimization, "_get_redis", lambda: client)
+        monkeypatch.setattr(scheduled_tasks, "_run_health_checks", lambda: status)
+
+        assert scheduled_tasks.health_check() == status
+        client.set.assert_called_once_with(
+            scheduled_tasks.HEALTH_CACHE_KEY,
+            json.dumps(status),
+            ex=scheduled_tasks.HEALTH_CACHE_TTL,
+        )
+
+
+class TestDailyScrapeLock:
+    """Test that overlapping daily scrapes are skipped."""
+
+    def test_skips_when_lock_held(self, monkeypatch):
+        """Test that no scrape is queued while the previous run holds the lock."""
+        from tasks import job_optimization, scheduled_tasks
+
+        client = MagicMock()
+        client.set.return_value = None
+        apply_async = MagicMock()
+        monkeypatch.setattr(job_optimization, "_get_redis", lambda: client)
+        monkeypatch.setattr(
+            scheduled_tasks.scrape_all_accounts, "apply_async", apply_async
+        )
+
+        result = scheduled_tasks.daily_scrape_all()
+
+        assert result["status"] == "skipped"
+        apply_async.assert_not_called()
+
+    def test_lock_released_only_by_owner(self, monkeypatch):
+        """Test that the lock is deleted only by the task that holds it."""
+        from tasks import job_optimization, scheduled_tasks
+
+        client = MagicMock()
+        client.get.return_value = b"task-1"
+        monkeypatch.setattr(job_optimization, "_get_redis", lambda: client)
+
+        scheduled_tasks._release_daily_scrape_lock("task-2")
+        client.delete.assert_not_called()
+
+        scheduled_tasks._release_daily_scrape_lock("task-1")
+        client.delete.assert_called_once_with(scheduled_tasks.DAILY_SCRAPE_LOCK_KEY)
+
+
+class TestDropExpiredJobPartitions:
+    """Test partition-based cleanup of old jobs."""
+
+    def test_drops_only_fully_expired_months(self):
+        """Test that partitions ending after the cutoff are kept."""
+        from datetime import datetime
+        from tasks.scheduled_tasks import _drop_expired_job_partitions
+
+        session = MagicMock()
+        session.get_bind.return_value.dialect.name = "postgresql"
+        session.execute.return_value.scalars.return_value = [
+            "job_y2024_m11",
+            "job_y2024_m12",
+            "job_y2025_m01",
+            "job_default",
+        ]
+
+        dropped = _drop_expired_job_partitions(session, datetime(2025, 1, 15))
+
+        assert dropped == ["job_y2024_m11", "job_y2024_m12"]
+
+    def test_noop_on_other_dialects(self):
+        """Test that non-PostgreSQL databases fall back to row deletes."""
+        from datetime import datetime
+        from tasks.scheduled_tasks import _drop_expired_job_partitions
+
+        session = MagicMock()
+        session.get_bind.return_value.dialect.name = "sqlite"
+
+        assert _drop_expired_job_partitions(session, datetime(2025, 1, 15)) == []
+        session.execute.assert_not_called()
+
+
+class TestRunHealthChecks:
+    """Test merging of concurrently run health checks."""
+
+    def test_worst_status_wins(self, monkeypatch):
+        """Test that a degraded check cannot mask an unhealthy one."""
+        from tasks import scheduled_tasks
+
+        monkeypatch.setattr(
+            scheduled_tasks,
+            "_check_database",
+            lambda: ("unhealthy", {"database": "error: down"}),
+        )
+        monkeypatch.setattr(
+            scheduled_tasks,
+            "_check_workers",
+            lambda: ("degraded", {"redis": "ok", "celery_workers": 0}),
+        )
+
+        status = scheduled_tasks._run_health_checks()
+
+        assert status["status"] == "unhealthy"
+        assert status["checks"] == {
+            "database": "error: down",
+            "redis": "ok",
+            "celery_workers": 0,
+        }
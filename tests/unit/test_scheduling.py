@@ -0,0 +1,356 @@
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from models.job import Job
+
+
+class TestProcessDueScheduledJobs:
+    """Test dispatching of due scheduled jobs."""
+
+    def _add_job(self, session, job_id, **columns):
+        session.add(
+            Job(
+                job_id=job_id,
+                job_type="scheduled",
+                status="scheduled",
+                paused=False,
+                scheduled_for=datetime.utcnow() - timedelta(minutes=1),
+                **columns,
+            )
+        )
+
+    def _patch_dispatch(self, monkeypatch, Session, ids):
+        from tasks import scheduling
+
+        group = MagicMock()
+        group.return_value.apply_async.return_value = SimpleNamespace(
+            results=[SimpleNamespace(id=task_id) for task_id in ids]
+        )
+        monkeypatch.setattr(scheduling, "get_db_session", Session)
+        monkeypatch.setattr(scheduling, "group", group)
+        monkeypatch.setattr(
+            scheduling.celery_app, "tasks", {"test.task": MagicMock()}
+        )
+        return group
+
+    def test_updates_are_persisted(self, monkeypatch, db_engine):
+        """Test that dispatched jobs are updated in the database."""
+        from tasks import scheduling
+
+        Session = sessionmaker(bind=db_engine)
+        session = Session()
+        self._add_job(session, "once", task_name="test.task")
+        self._add_job(
+            session,
+            "cron",
+            task_name="test.task",
+            task_kwargs='{"platform": "x"}',
+            recurring=True,
+            cron_expression="0 * * * *",
+        )
+        session.commit()
+        session.close()
+        group = self._patch_dispatch(monkeypatch, Session, ["t1", "t2"])
+
+        scheduling.process_due_scheduled_jobs()
+
+        group.return_value.apply_async.assert_called_once()
+        session = Session()
+        jobs = {job.job_id: job for job in session.query(Job).all()}
+        session.close()
+        assert jobs["t1"].status == "pending"
+        assert jobs["t2"].status == "scheduled"
+        assert jobs["t2"].scheduled_for > datetime.utcnow()
+        assert jobs["t2"].task_name == "test.task"
+
+    def test_legacy_json_task_info_is_migrated(self, monkeypatch, db_engine):
+        """Test that task info stored in result moves to the new columns."""
+        from tasks import scheduling
+
+        Session = sessionmaker(bind=db_engine)
+        session = Session()
+        self._add_job(
+            session,
+            "legacy",
+            result=json.dumps(
+                {
+                    "task_name": "test.task",
+                    "task_kwargs": {"platform": "x"},
+                    "cron_expression": "0 * * * *",
+                    "recurring": True,
+                }
+            ),
+        )
+        session.commit()
+        session.close()
+        self._patch_dispatch(monkeypatch, Session, ["t1"])
+
+        scheduling.process_due_scheduled_jobs()
+
+        session = Session()
+        job = session.query(Job).one()
+        session.close()
+        assert job.job_id == "t1"
+        assert job.status == "scheduled"
+        assert job.task_name == "test.task"
+        assert json.loads(job.task_kwargs) == {"platform": "x"}
+        assert job.recurring is True
+        assert job.result is None
+
+    def test_dispatches_one_group_per_page(self, monkeypatch, db_engine):
+        """Test that due jobs are paged by primary key and all dispatched."""
+        from tasks import scheduling
+
+        Session = sessionmaker(bind=db_engine)
+        session = Session()
+        for job_id in ("a", "b", "c"):
+            self._add_job(session, job_id, task_name="test.task")
+        session.commit()
+        session.close()
+        group = self._patch_dispatch(monkeypatch, Session, [])
+        group.return_value.apply_async.side_effect = [
+            SimpleNamespace(results=[SimpleNamespace(id=i) for i in ("t1", "t2")]),
+            SimpleNamespace(results=[SimpleNamespace(id="t3")]),
+        ]
+        monkeypatch.setattr(scheduling, "SCHEDULED_COMMIT_BATCH", 2)
+
+        scheduling.process_due_scheduled_jobs()
+
+        session = Session()
+        statuses = [job.status for job in session.query(Job).all()]
+        session.close()
+        assert group.return_value.apply_async.call_count == 2
+        assert statuses == ["pending"] * 3
+
+    def test_shared_cron_expression_parsed_once(self, monkeypatch, db_engine):
+        """Test that jobs sharing a cron expression get the same next run."""
+        from tasks import scheduling
+
+        Session = sessionmaker(bind=db_engine)
+        session = Session()
+        for job_id in ("a", "b"):
+            self._add_job(
+                session,
+                job_id,
+                task_name="test.task",
+                recurring=True,
+                cron_expression="*/5 * * * *",
+            )
+        session.commit()
+        session.close()
+        self._patch_dispatch(monkeypatch, Session, ["t1", "t2"])
+        croniter = MagicMock(wraps=scheduling.croniter)
+        monkeypatch.setattr(scheduling, "croniter", croniter)
+
+        scheduling.process_due_scheduled_jobs()
+
+        session = Session()
+        next_runs = {job.scheduled_for for job in session.query(Job).all()}
+        session.close()
+        assert croniter.call_count == 1
+        assert len(next_runs) == 1
+
+
+class TestScheduleJobsBulk:
+    """Test bulk job scheduling."""
+
+    def test_inserts_all_specs(self, monkeypatch, db_engine):
+        """Test that cron and one-off specs are inserted in batches."""
+        from tasks import scheduling
+
+        Session = sessionmaker(bind=db_engine)
+        monkeypatch.setattr(scheduling, "get_db_session", Session)
+        task = SimpleNamespace(name="test.task")
+        run_at = datetime.utcnow() + timedelta(hours=1)
+        specs = [
+            {"job_type": "cron", "task_func": task, "cron_expression": "0 * * * *"}
+            for _ in range(3)
+        ]
+        specs.append(
+            {
+                "job_type": "once",
+                "task_func": task,
+                "scheduled_for": run_at,
+                "task_kwargs": {"platform": "x"},
+            }
+        )
+
+        job_ids = scheduling.schedule_jobs_bulk(specs, batch_size=2)
+
+        session = Session()
+        jobs = {job.job_id: job for job in session.query(Job).all()}
+        session.close()
+        assert list(jobs) == job_ids
+        assert [job.recurring for job in jobs.values()] == [True] * 3 + [False]
+        assert jobs[job_ids[-1]].scheduled_for == run_at
+        assert json.loads(jobs[job_ids[-1]].task_kwargs) == {"platform": "x"}
+        assert all(job.paused is False for job in jobs.values())
+
+    def test_invalid_cron_inserts_nothing(self, monkeypatch, db_engine):
+        """Test that one bad spec rejects the whole batch."""
+        from tasks import scheduling
+
+        Session = sessionmaker(bind=db_engine)
+        monkeypatch.setattr(scheduling, "get_db_session", Session)
+        task = SimpleNamespace(name="test.task")
+        specs = [
+            {"job_type": "ok", "task_func": task, "cron_expression": "0 * * * *"},
+            {"job_type": "bad", "task_func": task, "cron_expression": "nope"},
+        ]
+
+        with pytest.raises(ValueError):
+            scheduling.schedule_jobs_bulk(specs)
+
+        session = Session()
+        assert session.query(Job).count() == 0
+        session.close()
+
+
+class TestScheduleSingleJob:
+    """Test single-job scheduling helpers."""
+
+    def test_schedule_job_with_cron_inserts_row(self, monkeypatch, db_engine):
+        """Test that a cron job row is inserted with a generated job_id."""
+        from tasks import scheduling
+
+        Session = sessionmaker(bind=db_engine)
+        monkeypatch.setattr(scheduling, "get_db_session", Session)
+
+        job_id = scheduling.schedule_job_with_cron(
+            "cron", "0 * * * *", SimpleNamespace(name="test.task"), platform="x"
+        )
+
+        session = Session()
+        job = session.query(Job).filter_by(job_id=job_id).one()
+        session.close()
+        assert job.status == "scheduled"
+        assert job.recurring is True
+        assert job.paused is False
+        assert job.created_at is not None
+        assert json.loads(job.task_kwargs) == {"platform": "x"}
+
+
+class TestConditionalJobs:
+    """Test event-driven conditional job dispatch."""
+
+    def test_publish_condition_queues_trigger(self, monkeypatch):
+        """Test that publishing a condition enqueues the trigger task."""
+        from tasks import scheduled_tasks, scheduling
+
+        delay = MagicMock()
+        monkeypatch.setattr(scheduled_tasks.trigger_conditional_jobs, "delay", delay)
+
+        scheduling.publish_condition("report")
+
+        delay.assert_called_once_with("report")
+
+    def test_dispatch_starts_only_matching_jobs(self, monkeypatch, db_engine):
+        """Test that only unpaused jobs of the published type are started."""
+        from tasks import scheduling
+
+        Session = sessionmaker(bind=db_engine)
+        session = Session()
+        for job_id, job_type, paused in (
+            ("ready", "report", False),
+            ("paused", "report", True),
+            ("other", "export", False),
+        ):
+            session.add(
+                Job(
+                    job_id=job_id,
+                    job_type=job_type,
+                    status="conditional",
+                    paused=paused,
+                    task_name="test.task",
+                )
+            )
+        session.commit()
+        session.close()
+        group = MagicMock()
+        group.return_value.apply_async.return_value = SimpleNamespace(
+            results=[SimpleNamespace(id="t1")]
+        )
+        monkeypatch.setattr(scheduling, "get_db_session", Session)
+        monkeypatch.setattr(scheduling, "group", group)
+        monkeypatch.setattr(
+            scheduling.celery_app, "tasks", {"test.task": MagicMock()}
+        )
+
+        assert scheduling.dispatch_conditional_jobs("report") == 1
+
+        session = Session()
+        statuses = {job.job_id: job.status for job in session.query(Job).all()}
+        session.close()
+        assert statuses == {
+            "t1": "pending",
+            "paused": "conditional",
+            "other": "conditional",
+        }
+
+    def test_callable_condition_is_deprecated(self, monkeypatch):
+        """Test that a callable condition_func warns and waits for an event."""
+        from tasks import scheduling
+
+        insert_job = MagicMock(return_value=(1, "job-1"))
+        monkeypatch.setattr(scheduling, "_insert_job", insert_job)
+
+        with pytest.warns(DeprecationWarning):
+            scheduling.schedule_conditional_job(
+                lambda: True, "report", SimpleNamespace(name="test.task")
+            )
+
+        result = json.loads(insert_job.call_args.kwargs["result"])
+        assert result["condition_type"] == "event"
+
+    def test_unknown_condition_is_rejected(self):
+        """Test that an unknown condition name raises ValueError."""
+        from tasks import scheduling
+
+        with pytest.raises(ValueError):
+            scheduling.schedule_conditional_job(
+                "disk_full", "report", SimpleNamespace(name="test.task")
+            )
+
+    def test_poll_starts_queue_empty_jobs(self, monkeypatch, db_engine):
+        """Test that polling starts queue_empty jobs but not event jobs."""
+        from tasks import scheduling
+
+        Session = sessionmaker(bind=db_engine)
+        session = Session()
+        for job_id, condition_type in (
+            ("polled", "queue_empty"),
+            ("event", "event"),
+        ):
+            session.add(
+                Job(
+                    job_id=job_id,
+                    job_type="report",
+                    status="conditional",
+                    task_name="test.task",
+                    result=json.dumps({"condition_type": condition_type}),
+                )
+            )
+        session.commit()
+        session.close()
+        group = MagicMock()
+        group.return_value.apply_async.return_value = SimpleNamespace(
+            results=[SimpleNamespace(id="t1")]
+        )
+        monkeypatch.setattr(scheduling, "get_db_session", Session)
+        monkeypatch.setattr(scheduling, "group", group)
+        monkeypatch.setattr(
+            scheduling.celery_app, "tasks", {"test.task": MagicMock()}
+        )
+        monkeypatch.setitem(scheduling.CONDITION_CHECKS, "queue_empty", lambda: True)
+
+        assert scheduling.poll_conditional_jobs() == 1
+
+        session = Session()
+        statuses = {job.job_id: job.status for job in session.query(Job).all()}
+        session.close()
+        assert statuses == {"t1": "pending", "event": "conditional"}
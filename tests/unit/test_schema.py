@@ -135,6 +135,28 @@ class TestFactFollowersSnapshot:
             pass
 
 
+    def test_calculated_engagement_treats_missing_counts_as_zero(
+        self, db_session, sample_account
+    ):
+        """Test that calculated_engagement sums counts in Python and SQL."""
+        snapshot = FactFollowersSnapshot(
+            account_key=sample_account.account_key,
+            snapshot_date=date.today(),
+            likes_count=500,
+            shares_count=100,
+        )
+        db_session.add(snapshot)
+        db_session.commit()
+
+        assert snapshot.calculated_engagement == 600
+        assert (
+            db_session.query(FactFollowersSnapshot)
+            .filter(FactFollowersSnapshot.calculated_engagement == 600)
+            .count()
+            == 1
+        )
+
+
 class TestFactSocialPost:
     """Test the FactSocialPost model."""
 
@@ -39,6 +39,121 @@ def test_init_db_with_relative_path():
             os.chdir("/")  # Reset to avoid issues
 
 
+def test_init_db_sqlite_file_pools_connections():
+    """Test that SQLite file databases pool connections with WAL enabled."""
+    from sqlalchemy import text
+    from sqlalchemy.pool import QueuePool
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = init_db(os.path.join(tmpdir, "pooled.db"))
+        try:
+            assert isinstance(engine.pool, QueuePool)
+            with engine.connect() as conn:
+                mode = conn.execute(text("PRAGMA journal_mode")).scalar()
+            assert mode == "wal"
+        finally:
+            engine.dispose()
+
+
+def test_init_db_keeps_duplicate_snapshots(caplog):
+    """Test that init_db never deletes duplicate snapshots to add the index."""
+    import sqlite3
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "legacy.db")
+        init_db(db_path).dispose()
+        conn = sqlite3.connect(db_path)
+        conn.execute("DROP INDEX uq_fact_snapshot_account_date")
+        conn.execute(
+            "INSERT INTO dim_account (account_key, platform, handle) "
+            "VALUES (1, 'x', 'dup')"
+        )
+        conn.executemany(
+            "INSERT INTO fact_followers_snapshot "
+            "(account_key, snapshot_date, followers_count) VALUES (1, ?, ?)",
+            [("2024-01-01", 1), ("2024-01-01", 2)],
+        )
+        conn.commit()
+        conn.close()
+
+        init_db(db_path).dispose()
+
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute("SELECT COUNT(*) FROM fact_followers_snapshot").fetchone()
+        index = conn.execute(
+            "SELECT 1 FROM sqlite_master "
+            "WHERE name = 'uq_fact_snapshot_account_date'"
+        ).fetchone()
+        conn.close()
+        assert rows == (2,)
+        assert index is None
+        assert "migration 011" in caplog.text
+
+
+def test_init_db_converts_legacy_paused_strings():
+    """Test that init_db turns 'true'/'false' job.paused strings into booleans."""
+    import sqlite3
+    from sqlalchemy import select
+    from sqlalchemy.orm import Session
+    from models.job import Job
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "legacy.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE job (id INTEGER PRIMARY KEY, job_id VARCHAR NOT NULL, "
+            "job_type VARCHAR NOT NULL, status VARCHAR NOT NULL, "
+            "scheduled_for DATETIME, paused VARCHAR, created_at DATETIME NOT NULL)"
+        )
+        conn.executemany(
+            "INSERT INTO job (job_id, job_type, status, paused, created_at) "
+            "VALUES (?, 'scheduled', 'scheduled', ?, '2024-01-01')",
+            [("on", "true"), ("off", "false"), ("unset", None)],
+        )
+        conn.commit()
+        conn.close()
+
+        engine = init_db(db_path)
+        with Session(engine) as session:
+            paused = session.scalars(
+                select(Job.job_id).where(Job.paused.is_(True))
+            ).all()
+            running = session.scalars(
+                select(Job.job_id).where(Job.paused.is_(False))
+            ).all()
+        engine.dispose()
+
+        assert paused == ["on"]
+        assert sorted(running) == ["off", "unset"]
+
+
+def test_init_db_adds_job_schedule_columns():
+    """Test that init_db adds the task/cron columns to an existing job table."""
+    import sqlite3
+    from sqlalchemy.orm import Session
+    from models.job import Job
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "legacy.db")
+        init_db(db_path).dispose()
+        conn = sqlite3.connect(db_path)
+        for column in ("task_name", "task_kwargs", "cron_expression", "recurring"):
+            conn.execute(f"ALTER TABLE job DROP COLUMN {column}")
+        conn.execute(
+            "INSERT INTO job (job_id, job_type, status, paused, created_at) "
+            "VALUES ('old', 'scheduled', 'scheduled', 0, '2024-01-01')"
+        )
+        conn.commit()
+        conn.close()
+
+        engine = init_db(db_path)
+        with Session(engine) as session:
+            job = session.query(Job).filter_by(job_id="old").one()
+            assert job.task_name is None
+            assert job.recurring is False
+        engine.dispose()
+
+
 def test_init_db_invalid_path():
     """Test that invalid paths raise appropriate errors."""
     with pytest.raises(ValueError):
@@ -0,0 +1,421 @@
+from datetime import date
+from unittest.mock import MagicMock
+
+import pytest
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from scraper.schema import DimAccount, FactFollowersSnapshot
+
+
+class TestScrapePlatform:
+    """Test the scrape_platform task and its chord."""
+
+    def _add_accounts(self, session):
+        session.add_all(
+            [
+                DimAccount(account_key=1, platform="x", handle="done"),
+                DimAccount(account_key=2, platform="x", handle="new"),
+            ]
+        )
+        session.add(
+            FactFollowersSnapshot(
+                account_key=1, snapshot_date=date.today(), followers_count=5
+            )
+        )
+        session.commit()
+
+    def test_dispatches_only_accounts_without_snapshot(
+        self, monkeypatch, db_engine, db_session
+    ):
+        """Test that the chord header only covers accounts still to scrape."""
+        from tasks import scraper_tasks
+
+        self._add_accounts(db_session)
+        Session = sessionmaker(bind=db_engine)
+        chord = MagicMock()
+        monkeypatch.setattr(scraper_tasks, "get_db_session", lambda _: Session())
+        monkeypatch.setattr(scraper_tasks, "chord", chord)
+        monkeypatch.setattr(scraper_tasks, "update_job_progress", MagicMock())
+
+        result = scraper_tasks.scrape_platform.apply(args=("x",)).get()
+
+        assert result["status"] == "dispatched"
+        assert result["queued"] == 1
+        header = chord.call_args.args[0]
+        assert [task.args[0] for task in header.tasks] == [2]
+        callback = chord.return_value.call_args.args[0]
+        assert callback.args[1:] == ("x", 2)
+
+    def test_account_task_and_callback_complete_job(
+        self, monkeypatch, db_engine, db_session
+    ):
+        """Test that stored snapshots are counted when the job completes."""
+        from models.job import Job
+        from tasks import scraper_tasks
+
+        self._add_accounts(db_session)
+        db_session.add(Job(job_id="platform-1", job_type="scrape_platform"))
+        db_session.commit()
+        Session = sessionmaker(bind=db_engine)
+        scraper = MagicMock()
+        scraper.scrape.return_value = {
+            "followers_count": 10,
+            "likes_count": 2,
+            "comments_count": 3,
+        }
+        monkeypatch.setattr(scraper_tasks, "get_db_session", lambda _: Session())
+        monkeypatch.setattr(scraper_tasks, "get_worker_scraper", lambda mode: scraper)
+
+        stored = scraper_tasks.scrape_platform_account(2)
+        result = scraper_tasks.finish_platform_scrape([stored], "platform-1", "x", 2)
+
+        assert result["processed"] == 2
+        session = Session()
+        snapshot = session.query(FactFollowersSnapshot).filter_by(account_key=2).one()
+        job = session.query(Job).filter_by(job_id="platform-1").one()
+        session.close()
+        assert snapshot.followers_count == 10
+        assert snapshot.engagements_total == 5
+        assert job.status == "completed"
+
+
+    def test_account_task_updates_existing_snapshot(
+        self, monkeypatch, db_engine, db_session
+    ):
+        """Test that rescraping an account with today's row updates it."""
+        from tasks import scraper_tasks
+
+        self._add_accounts(db_session)
+        Session = sessionmaker(bind=db_engine)
+        scraper = MagicMock()
+        scraper.scrape.return_value = {"followers_count": 10}
+        monkeypatch.setattr(scraper_tasks, "get_db_session", lambda _: Session())
+        monkeypatch.setattr(scraper_tasks, "get_worker_scraper", lambda mode: scraper)
+
+        assert scraper_tasks.scrape_platform_account(1) is True
+
+        session = Session()
+        snapshot = session.query(FactFollowersSnapshot).filter_by(account_key=1).one()
+        session.close()
+        assert snapshot.followers_count == 10
+
+
+class TestSnapshotCounts:
+    """Test conversion of scraped counts to snapshot columns."""
+
+    def test_converts_and_maps_counts(self):
+        """Test that values are coerced and keys mapped to column names."""
+        from tasks.scraper_tasks import _snapshot_counts
+
+        counts = _snapshot_counts(
+            {
+                "likes_count": "4.0",
+                "comments_count": None,
+                "shares_count": "x",
+                "views_count": 7,
+            }
+        )
+
+        assert counts["likes_count"] == 4
+        assert counts["comments_count"] == 0
+        assert counts["shares_count"] == 0
+        assert counts["video_views"] == 7
+        assert counts["engagements_total"] == 4
+        assert "views_count" not in counts
+
+
+class TestUpsertSnapshot:
+    """Test single-statement snapshot upserts."""
+
+    def test_second_upsert_updates_same_row(self, db_engine, db_session):
+        """Test that a repeat for the same day updates instead of inserting."""
+        from tasks.scraper_tasks import _upsert_snapshot
+
+        db_session.add(DimAccount(account_key=1, platform="x", handle="a"))
+        db_session.commit()
+        for followers in (10, 20):
+            _upsert_snapshot(
+                db_session,
+                FactFollowersSnapshot(
+                    account_key=1,
+                    snapshot_date=date.today(),
+                    followers_count=followers,
+                ),
+            )
+        db_session.commit()
+
+        snapshots = db_session.query(FactFollowersSnapshot).all()
+        assert [s.followers_count for s in snapshots] == [20]
+
+    def test_upsert_without_unique_index_updates_newest_row(self, tmp_path):
+        """Test the select-then-update fallback on a database with duplicates."""
+        import sqlite3
+        from sqlalchemy.orm import Session
+        from scraper.schema import init_db
+        from tasks.scraper_tasks import _upsert_snapshot
+
+        db_path = str(tmp_path / "legacy.db")
+        init_db(db_path).dispose()
+        conn = sqlite3.connect(db_path)
+        conn.execute("DROP INDEX uq_fact_snapshot_account_date")
+        conn.execute(
+            "INSERT INTO dim_account (account_key, platform, handle) "
+            "VALUES (1, 'x', 'a')"
+        )
+        conn.executemany(
+            "INSERT INTO fact_followers_snapshot "
+            "(account_key, snapshot_date, followers_count) VALUES (1, ?, ?)",
+            [(date.today().isoformat(), 1), (date.today().isoformat(), 2)],
+        )
+        conn.commit()
+        conn.close()
+
+        engine = init_db(db_path)
+        with Session(engine) as session:
+            _upsert_snapshot(
+                session,
+                FactFollowersSnapshot(
+                    account_key=1, snapshot_date=date.today(), followers_count=30
+                ),
+            )
+            session.commit()
+            followers = session.scalars(
+                select(FactFollowersSnapshot.followers_count).order_by(
+                    FactFollowersSnapshot.snapshot_id
+                )
+            ).all()
+        engine.dispose()
+
+        assert followers == [1, 30]
+
+
+class TestScrapeAccountRetries:
+    """Test retry decisions in scrape_account."""
+
+    def test_missing_account_fails_without_retry(
+        self, monkeypatch, db_engine, db_session
+    ):
+        """Test that a non-retryable error is raised instead of retried."""
+        from tasks import scraper_tasks
+
+        Session = sessionmaker(bind=db_engine)
+        retry = MagicMock()
+        monkeypatch.setattr(scraper_tasks, "get_db_session", lambda _: Session())
+        monkeypatch.setattr(scraper_tasks, "create_job_record", MagicMock())
+        monkeypatch.setattr(scraper_tasks.scrape_account, "retry", retry)
+
+        with pytest.raises(ValueError, match="not found"):
+            scraper_tasks.scrape_account.apply(args=(999,)).get()
+
+        retry.assert_not_called()
+
+    def test_empty_scrape_is_retried(self, monkeypatch, db_engine, db_session):
+        """Test that a scraper returning no data is retried with backoff."""
+        from tasks import scraper_tasks
+
+        db_session.add(DimAccount(account_key=1, platform="x", handle="one"))
+        db_session.commit()
+        Session = sessionmaker(bind=db_engine)
+        retry = MagicMock(side_effect=RuntimeError("retry"))
+        scraper = MagicMock()
+        scraper.scrape.return_value = None
+        monkeypatch.setattr(scraper_tasks, "get_db_session", lambda _: Session())
+        monkeypatch.setattr(scraper_tasks, "create_job_record", MagicMock())
+        monkeypatch.setattr(scraper_tasks, "update_job_progress", MagicMock())
+        monkeypatch.setattr(scraper_tasks, "get_worker_scraper", lambda _: scraper)
+        monkeypatch.setattr(scraper_tasks.scrape_account, "retry", retry)
+
+        with pytest.raises(RuntimeError, match="retry"):
+            scraper_tasks.scrape_account.apply(args=(1,)).get()
+
+        retry.assert_called_once()
+
+
+class TestScrapeSelectedAccounts:
+    """Test the scrape_selected_accounts task."""
+
+    def test_small_selection_runs_serially(self, monkeypatch, db_engine, db_session):
+        """Test that a selection under the threshold skips the thread pool."""
+        from tasks import scraper_tasks
+
+        db_session.add(DimAccount(account_key=1, platform="x", handle="one"))
+        db_session.commit()
+        Session = sessionmaker(bind=db_engine)
+        simulate = MagicMock()
+        monkeypatch.setattr(scraper_tasks, "get_db_session", lambda _: Session())
+        monkeypatch.setattr(scraper_tasks, "update_job_progress", MagicMock())
+        monkeypatch.setattr(scraper_tasks, "simulate_metrics", simulate)
+
+        scraper_tasks.scrape_selected_accounts.apply(args=([1],)).get()
+
+        assert simulate.call_args.kwargs["parallel"] is False
+        assert simulate.call_args.kwargs["max_workers"] == 1
+
+    def test_progress_written_only_to_job_row(
+        self, monkeypatch, db_engine, db_session
+    ):
+        """Test that progress goes to the job row, not the result backend."""
+        from tasks import scraper_tasks
+
+        db_session.add(DimAccount(account_key=1, platform="x", handle="one"))
+        db_session.commit()
+        Session = sessionmaker(bind=db_engine)
+        update_state = MagicMock()
+        progress = MagicMock()
+        monkeypatch.setattr(scraper_tasks, "get_db_session", lambda _: Session())
+        monkeypatch.setattr(scraper_tasks, "update_job_progress", progress)
+        monkeypatch.setattr(
+            scraper_tasks.scrape_selected_accounts, "update_state", update_state
+        )
+        monkeypatch.setattr(scraper_tasks, "simulate_metrics", MagicMock())
+
+        scraper_tasks.scrape_selected_accounts.apply(args=([1],)).get()
+
+        assert progress.called
+        update_state.assert_not_called()
+
+    def test_finalizes_job_row(self, monkeypatch, db_engine, db_session):
+        """Test that the job row is completed after the scrape."""
+        from models.job import Job
+        from tasks import scraper_tasks
+
+        db_session.add(DimAccount(account_key=1, platform="x", handle="one"))
+        db_session.commit()
+        Session = sessionmaker(bind=db_engine)
+        monkeypatch.setattr(scraper_tasks, "get_db_session", lambda _: Session())
+        monkeypatch.setattr(scraper_tasks, "update_job_progress", MagicMock())
+        monkeypatch.setattr(scraper_tasks, "simulate_metrics", MagicMock())
+
+        scraper_tasks.scrape_selected_accounts.apply(
+            args=([1],), task_id="selected-1"
+        ).get()
+
+        session = Session()
+        job = session.query(Job).filter_by(job_id="selected-1").one()
+        session.close()
+        assert job.status == "completed"
+        assert job.progress == 100.0
+        assert job.completed_at is not None
+
+
+class TestMarkJobRunning:
+    """Test starting jobs whose row the enqueuer created."""
+
+    def test_marks_existing_row_running(self, db_engine):
+        """Test that a pre-created row is updated and a missing one reported."""
+        from models.job import Job
+        from tasks import scraper_tasks
+
+        Session = sessionmaker(bind=db_engine)
+        session = Session()
+        session.add(Job(job_id="pre-1", job_type="scrape_all", status="pending"))
+        session.commit()
+
+        assert scraper_tasks._mark_job_running(session, "pre-1")
+        assert not scraper_tasks._mark_job_running(session, "pre-missing")
+
+        job = session.query(Job).filter_by(job_id="pre-1").one()
+        session.close()
+        assert job.status == "running"
+        assert job.started_at is not None
+
+
+class TestJobProgressCallback:
+    """Test throttling of simulate_metrics progress writes."""
+
+    def test_writes_only_on_percentage_change(self, monkeypatch):
+        """Test that per-account calls are coalesced but the last one is kept."""
+        from tasks import scraper_tasks
+
+        progress = MagicMock()
+        monkeypatch.setattr(scraper_tasks, "update_job_progress", progress)
+        monkeypatch.setattr(scraper_tasks.time, "monotonic", lambda: 100.0)
+
+        callback = scraper_tasks._job_progress_callback("job-1")
+        for processed in range(1, 1001):
+            callback(processed, 1000, "acct", 10.0, 1.0)
+
+        assert progress.call_count <= 71
+        assert progress.call_args.args[1] == 90
+        assert progress.call_args.args[3]["processed"] == 1000
+
+    def test_writes_again_after_interval(self, monkeypatch):
+        """Test that an unchanged percentage is rewritten after the interval."""
+        from tasks import scraper_tasks
+
+        clock = iter([100.0, 100.5, 102.0])
+        progress = MagicMock()
+        monkeypatch.setattr(scraper_tasks, "update_job_progress", progress)
+        monkeypatch.setattr(scraper_tasks.time, "monotonic", lambda: next(clock))
+
+        callback = scraper_tasks._job_progress_callback("job-1")
+        for processed in (1, 2, 3):
+            callback(processed, 1000, "acct", 10.0, 1.0)
+
+        assert progress.call_count == 2
+
+
+class TestBackfillAccount:
+    """Test the backfill_account task's job bookkeeping."""
+
+    def test_completes_job_without_holding_session(
+        self, monkeypatch, db_engine, db_session
+    ):
+        """Test that the job is finalized and no session spans the backfill."""
+        from models.job import Job
+        from tasks import scraper_tasks
+
+        db_session.add(DimAccount(account_key=7, platform="x", handle="seven"))
+        db_session.commit()
+        Session = sessionmaker(bind=db_engine)
+        open_sessions = []
+        backfill_calls = []
+
+        def get_session(_):
+            session = Session()
+            open_sessions.append(session)
+            return session
+
+        def backfill(**kwargs):
+            assert all(not s.in_transaction() for s in open_sessions)
+            backfill_calls.append(kwargs)
+
+        monkeypatch.setattr(scraper_tasks, "get_db_session", get_session)
+        monkeypatch.setattr(scraper_tasks, "update_job_progress", MagicMock())
+        monkeypatch.setattr(scraper_tasks, "backfill_history", backfill)
+
+        result = scraper_tasks.backfill_account.apply(
+            args=(7,), kwargs={"days": 5}, task_id="backfill-1"
+        ).get()
+
+        session = Session()
+        job = session.query(Job).filter_by(job_id="backfill-1").one()
+        session.close()
+        assert result["account_handle"] == "seven"
+        assert backfill_calls[0]["account_keys"] == [7]
+        assert job.status == "completed"
+        assert job.progress == 100.0
+
+    def test_missing_account_marks_job_failed(self, monkeypatch, db_engine, db_session):
+        """Test that a missing account fails the job record."""
+        from models.job import Job
+        from tasks import scraper_tasks
+
+        Session = sessionmaker(bind=db_engine)
+        monkeypatch.setattr(scraper_tasks, "get_db_session", lambda _: Session())
+        monkeypatch.setattr(
+            scraper_tasks.backfill_account, "retry", MagicMock(side_effect=ValueError)
+        )
+
+        with pytest.raises(ValueError):
+            scraper_tasks.backfill_account.apply(
+                args=(999,), task_id="backfill-2"
+            ).get()
+
+        session = Session()
+        job = session.query(Job).filter_by(job_id="backfill-2").one()
+        session.close()
+        assert job.status == "failed"
+        assert "not found" in job.error_message
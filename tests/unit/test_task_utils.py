@@ -0,0 +1,185 @@
+from unittest.mock import MagicMock
+
+
+class TestWorkerEngineLifecycle:
+    """Test per-process handling of cached task engines."""
+
+    def test_fork_drops_inherited_connections(self, monkeypatch):
+        """Test that a forked worker discards pooled connections unclosed."""
+        from tasks import utils
+
+        engine = MagicMock()
+        monkeypatch.setattr(utils, "_engine_cache", {"db": engine})
+
+        utils._reset_engines_after_fork()
+
+        engine.dispose.assert_called_once_with(close=False)
+
+    def test_shutdown_closes_connections(self, monkeypatch):
+        """Test that worker shutdown closes pooled connections."""
+        from tasks import utils
+
+        engine = MagicMock()
+        monkeypatch.setattr(utils, "_engine_cache", {"db": engine})
+
+        utils._dispose_engines()
+
+        engine.dispose.assert_called_once_with()
+
+    def test_worker_boot_warms_default_engine(self, monkeypatch):
+        """Test that worker init opens and returns one pooled connection."""
+        from tasks import utils
+
+        session = MagicMock()
+        monkeypatch.setattr(utils, "get_db_session", lambda: session)
+
+        utils._warm_default_engine()
+
+        session.connection.assert_called_once_with()
+        session.close.assert_called_once_with()
+
+    def test_worker_boot_survives_unavailable_database(self, monkeypatch):
+        """Test that a failing warm-up is logged instead of raised."""
+        from tasks import utils
+
+        monkeypatch.setattr(
+            utils, "get_db_session", MagicMock(side_effect=ValueError("no db"))
+        )
+
+        utils._warm_default_engine()
+
+
+class TestGetDbSession:
+    """Test cached task session factories."""
+
+    def test_factory_cached_without_expire_on_commit(self, monkeypatch):
+        """Test that one factory is reused and commits keep loaded state."""
+        from tasks import utils
+
+        init_db = MagicMock()
+        monkeypatch.setattr(utils, "_engine_cache", {})
+        monkeypatch.setattr(utils, "_sessionmaker_cache", {})
+        monkeypatch.setattr(utils, "init_db", init_db)
+
+        first = utils.get_db_session("cached.db")
+        second = utils.get_db_session("cached.db")
+
+        init_db.assert_called_once_with("cached.db")
+        assert first is not second
+        assert first.expire_on_commit is False
+
+
+class TestWorkerScraper:
+    """Test per-process scraper reuse."""
+
+    def test_scraper_built_once_per_mode(self, monkeypatch):
+        """Test that repeated lookups reuse the scraper until the next fork."""
+        from tasks import utils
+
+        factory = MagicMock(side_effect=lambda mode: MagicMock())
+        monkeypatch.setattr(utils, "_scraper_cache", {})
+        monkeypatch.setattr(utils, "get_scraper", factory)
+
+        first = utils.get_worker_scraper("real")
+        assert utils.get_worker_scraper("real") is first
+        assert factory.call_count == 1
+
+        utils._reset_scrapers_after_fork()
+
+        assert utils.get_worker_scraper("real") is not first
+        assert factory.call_count == 2
+
+
+class TestUpdateJobProgress:
+    """Test job progress updates."""
+
+    def test_updates_progress_status_and_meta(self, monkeypatch, db_engine):
+        """Test that progress is clamped and meta stored as JSON."""
+        import json
+
+        from sqlalchemy.orm import sessionmaker
+
+        from models.job import Job
+        from tasks import utils
+
+        Session = sessionmaker(bind=db_engine)
+        session = Session()
+        session.add(Job(job_id="progress-1", job_type="test", status="pending"))
+        session.commit()
+        session.close()
+        monkeypatch.setattr(utils, "get_db_session", Session)
+
+        utils.update_job_progress("progress-1", 150, "RUNNING", {"processed": 3})
+        utils.update_job_progress("missing", 10)
+
+        session = Session()
+        job = session.query(Job).filter_by(job_id="progress-1").one()
+        session.close()
+        assert job.progress == 100.0
+        assert job.status == "running"
+        assert json.loads(job.result) == {"processed": 3}
+
+    def test_skips_sub_point_changes_without_meta(self, monkeypatch):
+        """Test that tiny progress steps are dropped but terminal states write."""
+        from tasks import utils
+
+        session = MagicMock()
+        session.execute.return_value.rowcount = 1
+        factory = MagicMock(return_value=session)
+        monkeypatch.setattr(utils, "get_db_session", factory)
+        monkeypatch.setattr(utils, "_last_progress", {})
+
+        utils.update_job_progress("throttle-1", 10.0, "running")
+        utils.update_job_progress("throttle-1", 10.5, "running")
+        utils.update_job_progress("throttle-1", 11.0, "running")
+        utils.update_job_progress("throttle-1", 11.2, "running", {"message": "x"})
+        utils.update_job_progress("throttle-1", 11.3, "completed")
+
+        assert factory.call_count == 4
+        assert "throttle-1" not in utils._last_progress
+
+
+class TestCreateJobRecord:
+    """Test job record creation."""
+
+    def test_reuses_given_session(self, monkeypatch, db_engine):
+        """Test that a caller's session is used and left open."""
+        from sqlalchemy.orm import sessionmaker
+
+        from tasks import utils
+
+        factory = MagicMock()
+        monkeypatch.setattr(utils, "get_db_session", factory)
+        session = sessionmaker(bind=db_engine)()
+
+        job = utils.create_job_record("record-1", "test", session=session)
+
+        factory.assert_not_called()
+        assert job in session
+        assert job.status == "pending"
+        session.close()
+
+    def test_bulk_create_inserts_pending_jobs(self, monkeypatch, db_engine):
+        """Test that create_job_records writes every record as pending."""
+        from sqlalchemy.orm import sessionmaker
+
+        from models.job import Job
+        from tasks import utils
+
+        Session = sessionmaker(bind=db_engine)
+        monkeypatch.setattr(utils, "get_db_session", lambda db_path=None: Session())
+
+        count = utils.create_job_records(
+            [
+                {"job_id": "bulk-1", "job_type": "backfill_account", "account_key": 1},
+                {"job_id": "bulk-2", "job_type": "backfill_account", "account_key": 2},
+            ]
+        )
+
+        session = Session()
+        jobs = session.query(Job).filter(Job.job_id.in_(["bulk-1", "bulk-2"])).all()
+        session.close()
+        assert count == 2
+        assert sorted(j.account_key for j in jobs) == [1, 2]
+        assert all(j.status == "pending" and j.created_at for j in jobs)
+        assert utils.create_job_records([]) == 0